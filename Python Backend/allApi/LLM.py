@@ -3,6 +3,9 @@ import json
 from langchain_groq import ChatGroq
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from scenario_cache import feature_cache
+from metrics import observe_stage
+import llm_replay
 # from image_generation import generateImage
 
 from dotenv import load_dotenv
@@ -14,7 +17,8 @@ api_key = os.getenv("GROQ_API_KEY")
 # Initialize LLM
 llm = ChatGroq(
     model_name="llama3-70b-8192",  # You can also try "llama3-8b-8192"
-    api_key=api_key
+    api_key=api_key,
+    base_url=os.getenv("GROQ_BASE_URL")  # e.g. llm_stub_server.py for load tests; unset means Groq
 )
 
 # Define prompt template
@@ -58,19 +62,33 @@ Your task is to analyze the following hypothetical scenario and estimate its imp
 ---
 Respond only with a JSON object exactly like the format above.
 """)
+FEATURES_PROMPT_ID = llm_replay.prompt_id(prompt_template.template)
 
 # Function to run the climate impact estimator
-def run_climate_scenario_prediction(scenario: str):
+def run_climate_scenario_prediction(scenario: str, use_cache: bool = True):
+    # Features for the same (normalized) scenario are shared across predictors
+    if use_cache:
+        cached = feature_cache.get(scenario)
+        if cached is not None:
+            return dict(cached)
+
     chain = prompt_template | llm | StrOutputParser()
-    result = chain.invoke({"scenario": scenario})
+    with observe_stage("llm_extraction", "scenario_features"):
+        # LLM_MODE=record logs the raw answer, LLM_MODE=replay serves it from the log
+        result = llm_replay.invoke(
+            "scenario_features", FEATURES_PROMPT_ID, scenario, lambda: chain.invoke({"scenario": scenario})
+        )
 
     try:
         result_cleaned = result.strip().strip("```json").strip("```").strip()
         parsed_json = json.loads(result_cleaned)
-        return parsed_json
     except Exception as e:
         return f"Error parsing JSON: {e}\nRaw result:\n{result}"
 
+    if use_cache:
+        feature_cache.put(scenario, dict(parsed_json))
+    return parsed_json
+
 # Example usage
 # scenario = "What if half the earth becomes ice??"
 # prediction = run_climate_scenario_prediction(scenario)
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import time
+
+
+class ClientDisconnected(Exception):
+    """Raised when the HTTP client went away before the work finished."""
+
+
+async def cancel_on_disconnect(request, coro, poll_interval: float = 0.5):
+    """
+    Awaits `coro` while polling the client connection; if the client
+    disconnects first the work is cancelled and ClientDisconnected is raised.
+
+    Args:
+        request (Request): The incoming FastAPI/Starlette request.
+        coro: The coroutine doing the actual work.
+        poll_interval (float): Seconds between disconnect checks.
+
+    Returns:
+        The result of `coro`.
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                raise ClientDisconnected()
+    finally:
+        # Also covers the endpoint itself being cancelled
+        if not task.done():
+            task.cancel()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls sharing a key: the first caller starts the
+    computation and every duplicate that arrives while it is in flight awaits
+    the same result (or exception) instead of starting its own.
+    """
+
+    def __init__(self):
+        self._in_flight = {}
+        self.leaders = {}
+        self.coalesced = {}
+
+    async def do(self, namespace, key, compute):
+        """
+        Args:
+            namespace (str): Metrics bucket, usually the endpoint name.
+            key (str): Identity of the computation within the namespace.
+            compute: Zero-argument callable returning the coroutine to run.
+        """
+        flight_key = (namespace, key)
+        task = self._in_flight.get(flight_key)
+        if task is None:
+            self.leaders[namespace] = self.leaders.get(namespace, 0) + 1
+            task = asyncio.ensure_future(compute())
+            self._in_flight[flight_key] = task
+            task.add_done_callback(lambda done: self._finish(flight_key, done))
+        else:
+            self.coalesced[namespace] = self.coalesced.get(namespace, 0) + 1
+
+        # Shielded so one caller disconnecting doesn't cancel the others' result
+        return await asyncio.shield(task)
+
+    def _finish(self, flight_key, task):
+        self._in_flight.pop(flight_key, None)
+        # Mark the exception as retrieved in case every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self):
+        return {
+            "in_flight": len(self._in_flight),
+            "endpoints": {
+                namespace: {
+                    "executed": self.leaders.get(namespace, 0),
+                    "coalesced": self.coalesced.get(namespace, 0),
+                }
+                for namespace in sorted(set(self.leaders) | set(self.coalesced))
+            },
+        }
+
+
+def sse_event(event: str, data: dict) -> str:
+    """Formats one Server-Sent Events message with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_sse_tokens(request, token_stream, timeout: float):
+    """
+    Relays text chunks from `token_stream` as `token` SSE events, then a final
+    `done` event carrying the full text. Stops (and closes the model stream)
+    when the client disconnects; emits an `error` event on failure or when the
+    whole generation exceeds `timeout` seconds.
+    """
+    start = time.perf_counter()
+    deadline = start + timeout
+    parts = []
+    first_token_seconds = None
+    iterator = token_stream.__aiter__()
+    try:
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            try:
+                text = await asyncio.wait_for(iterator.__anext__(), remaining)
+            except StopAsyncIteration:
+                break
+            if await request.is_disconnected():
+                return
+            if first_token_seconds is None:
+                first_token_seconds = round(time.perf_counter() - start, 4)
+            parts.append(text)
+            yield sse_event("token", {"text": text})
+
+        yield sse_event("done", {
+            "prediction": "".join(parts),
+            "chunks": len(parts),
+            "first_token_seconds": first_token_seconds,
+            "total_seconds": round(time.perf_counter() - start, 4),
+        })
+    except asyncio.TimeoutError:
+        yield sse_event("error", {"error": "LLM request timed out"})
+    except Exception as e:
+        yield sse_event("error", {"error": str(e)})
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
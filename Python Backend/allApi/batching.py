@@ -0,0 +1,37 @@
+import numpy as np
+from metrics import observe_stage
+
+
+def batch_predict(features_list, build_row, predict_rows, component="batch"):
+    """
+    Builds one model input row per scenario, runs a single vectorized
+    prediction over every valid row and returns one outcome per scenario, in
+    input order. A scenario whose LLM features can't form a row is reported
+    as failed without affecting the others.
+
+    Args:
+        features_list (list): LLM feature dicts, one per scenario.
+        build_row (callable): features -> 1-D model input row.
+        predict_rows (callable): (X, input indices of X's rows) -> list of results.
+        component (str): Model name the stage timings are recorded under.
+
+    Returns:
+        list: {"success": True, "result": ...} or {"success": False, "error": ...} per scenario.
+    """
+    outcomes = [None] * len(features_list)
+    rows, valid = [], []
+    with observe_stage("preprocessing", component):
+        for i, features in enumerate(features_list):
+            try:
+                rows.append(np.asarray(build_row(features), dtype=np.float64).ravel())
+                valid.append(i)
+            except Exception as e:
+                outcomes[i] = {"success": False, "error": f"Invalid LLM features: {e!r}"}
+
+    if rows:
+        with observe_stage("inference", component):
+            results = predict_rows(np.vstack(rows), valid)
+        for i, result in zip(valid, results):
+            outcomes[i] = {"success": True, "result": result}
+
+    return outcomes
@@ -0,0 +1,232 @@
+import argparse
+import contextlib
+import hashlib
+import importlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+base_path = os.path.dirname(os.path.abspath(__file__))
+
+# Results land here by default, one file per commit
+RESULTS_DIR = os.path.join(base_path, ".benchmarks")
+
+SCENARIO = "What if half the earth becomes ice??"
+
+# ====================================
+# Benchmarked predictors
+# ====================================
+# name -> (module, function, positional args); scenario predictors get SCENARIO
+PREDICTORS = {
+    "temperature": ("pretrained_temp_xbg", "predict_temp", (SCENARIO,)),
+    "humidity": ("pretrained_humidity_xgb", "predict_humidity", (SCENARIO,)),
+    "croprate": ("pretrained_croprate_xgb", "predict_croprate", (SCENARIO,)),
+    "economic": ("pretrained_eco_xgb", "predict_eco", (SCENARIO,)),
+    "ozone": ("pretrained_ozone_xgb", "predict_ozone", (SCENARIO,)),
+    "adaptation": ("classify", "classify_adaptation", (SCENARIO,)),
+    "temperature_lstm": ("pretrained_temp_lstm", "predict_temp_lstm", ()),
+    "electricity": ("pretrained_electricity", "electricity_demand_prediction", (datetime(2025, 6, 1),)),
+}
+
+
+def stub_llm_features(scenario: str) -> dict:
+    """
+    Deterministic stand-in for run_climate_scenario_prediction: the same
+    scenario always yields the same in-range features, with no network call.
+    It also carries the ozone inputs the real prompt does not ask for.
+    """
+    seed = int(hashlib.sha256(scenario.encode("utf-8")).hexdigest()[:8], 16)
+
+    def pick(low, high, salt):
+        return round(low + (high - low) * (((seed >> salt) % 1000) / 999), 3)
+
+    return {
+        "meantemp": pick(-5, 45, 0),
+        "humidity": pick(60, 100, 1),
+        "wind_speed": pick(0, 8, 2),
+        "meanpressure": pick(1005, 1020, 3),
+        "Economic_Impact_Million_USD": pick(10, 1500, 4),
+        "Total_Precipitation_mm": pick(50, 3000, 5),
+        "CO2_Emissions_MT": pick(0.5, 30, 6),
+        "Crop_Yield_MT_per_HA": pick(0.5, 5, 7),
+        "Pesticide_Use_KG_per_HA": pick(0, 50, 8),
+        "Fertilizer_Use_KG_per_HA": pick(0, 100, 9),
+        "Soil_Health_Index": pick(30, 100, 10),
+        "solar_generation": pick(0, 2000, 11),
+        "Temperature": pick(-5, 45, 12),
+        "pressure_height": pick(5300, 5950, 13),
+        "Temperature_Sandburg": pick(25, 95, 14),
+        "Temperature_ElMonte": pick(25, 90, 15),
+        "Inversion_base_height": pick(100, 5000, 16),
+        "Pressure_gradient": pick(-70, 110, 17),
+        "Inversion_temperature": pick(25, 90, 18),
+        "Visibility": pick(0, 350, 19),
+        "Wind_speed": pick(0, 11, 20),
+        "Humidity": pick(15, 95, 21),
+    }
+
+
+def _install_llm_stub(module):
+    # The predictors bind run_climate_scenario_prediction at import time, so
+    # the predictor module gets the stub too
+    import LLM
+    LLM.run_climate_scenario_prediction = stub_llm_features
+    if hasattr(module, "run_climate_scenario_prediction"):
+        module.run_climate_scenario_prediction = stub_llm_features
+
+
+def _percentile(sorted_values, fraction):
+    # Nearest-rank percentile
+    index = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def _peak_rss_bytes():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _call_quietly(fn, args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+def measure(name, iterations):
+    """
+    Benchmarks one predictor inside the current (fresh) process: the first
+    call is the cold run, including imports and model loading; the next
+    `iterations` calls are warm. Allocations are traced over one extra warm
+    call so tracemalloc does not skew the timings.
+    """
+    module_name, function_name, args = PREDICTORS[name]
+    # LLM.py builds its ChatGroq client on import, which needs a key even
+    # though the stub means Groq is never called
+    os.environ.setdefault("GROQ_API_KEY", "benchmark-stub")
+
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    _install_llm_stub(module)
+    fn = getattr(module, function_name)
+    _call_quietly(fn, args)
+    cold_seconds = time.perf_counter() - start
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        _call_quietly(fn, args)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    tracemalloc.start()
+    _call_quietly(fn, args)
+    snapshot = tracemalloc.take_snapshot()
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocations = snapshot.statistics("filename")
+
+    return {
+        "cold_seconds": round(cold_seconds, 6),
+        "warm_iterations": iterations,
+        "warm_p50_seconds": round(_percentile(timings, 0.50), 6),
+        "warm_p95_seconds": round(_percentile(timings, 0.95), 6),
+        "warm_mean_seconds": round(sum(timings) / len(timings), 6),
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "traced_peak_bytes": traced_peak,
+        "retained_allocation_blocks": sum(stat.count for stat in allocations),
+        "retained_allocation_bytes": sum(stat.size for stat in allocations),
+    }
+
+
+def run_isolated(name, iterations):
+    # One interpreter per predictor so cold start and peak RSS are its own
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", name, "--iterations", str(iterations)],
+        cwd=base_path, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        error = (result.stderr.strip().splitlines() or ["worker failed"])[-1]
+        return {"error": error}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=base_path, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(previous, current):
+    # Warm p50 change per predictor, negative is faster
+    print(f"\n📈 Compared with {previous['commit']}:")
+    for name, result in current["predictors"].items():
+        before = previous["predictors"].get(name, {})
+        if "warm_p50_seconds" not in result or "warm_p50_seconds" not in before:
+            continue
+        change = (result["warm_p50_seconds"] / before["warm_p50_seconds"] - 1) * 100
+        print(f"  {name:<18} p50 {before['warm_p50_seconds'] * 1000:9.3f} ms -> "
+              f"{result['warm_p50_seconds'] * 1000:9.3f} ms ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every predictor with a stubbed LLM.")
+    parser.add_argument("predictors", nargs="*", help=f"subset of: {', '.join(PREDICTORS)}")
+    parser.add_argument("--iterations", type=int, default=50, help="warm calls per predictor")
+    parser.add_argument("--output", help="results JSON (default: .benchmarks/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to diff against")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(args.worker, args.iterations)))
+        return
+
+    names = args.predictors or list(PREDICTORS)
+    unknown = [name for name in names if name not in PREDICTORS]
+    if unknown:
+        parser.error(f"unknown predictor(s): {', '.join(unknown)}")
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iterations": args.iterations,
+        "predictors": {},
+    }
+
+    print(f"⏱️ Benchmarking {len(names)} predictor(s), {args.iterations} warm iterations each")
+    for name in names:
+        result = report["predictors"][name] = run_isolated(name, args.iterations)
+        if "error" in result:
+            print(f"  ❌ {name:<18} {result['error']}")
+        else:
+            print(f"  ✅ {name:<18} cold {result['cold_seconds'] * 1000:9.1f} ms | "
+                  f"p50 {result['warm_p50_seconds'] * 1000:8.3f} ms | p95 {result['warm_p95_seconds'] * 1000:8.3f} ms | "
+                  f"peak RSS {result['peak_rss_bytes'] / 2**20:7.1f} MiB | "
+                  f"traced peak {result['traced_peak_bytes'] / 2**10:8.1f} KiB")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import time
+from datetime import datetime
+
+from benchmark_predictors import RESULTS_DIR, SCENARIO, _git_commit, _install_llm_stub, stub_llm_features
+
+
+def _quietly(fn, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+def _predict(module_name, function_name, *args):
+    import importlib
+    module = importlib.import_module(module_name)
+    _install_llm_stub(module)
+    return _quietly(getattr(module, function_name), *args)
+
+
+# ====================================
+# Representative response payloads
+# ====================================
+# Raw predictor outputs from the real models with the stubbed LLM, so the
+# NumPy values are the ones the handlers actually return
+PREDICTIONS = {
+    "temperature": lambda: _predict("pretrained_temp_xbg", "predict_temp", SCENARIO),
+    "humidity": lambda: _predict("pretrained_humidity_xgb", "predict_humidity", SCENARIO),
+    "crop_yield": lambda: _predict("pretrained_croprate_xgb", "predict_croprate", SCENARIO),
+    "economic_impact": lambda: _predict("pretrained_eco_xgb", "predict_eco", SCENARIO),
+    "ozone": lambda: _predict("pretrained_ozone_xgb", "predict_ozone", SCENARIO),
+    "adaptation": lambda: _predict("classify", "classify_adaptation", SCENARIO),
+}
+
+
+def _composite():
+    results = {}
+    for name, predict in PREDICTIONS.items():
+        try:
+            results[name] = {"success": True, "result": predict(), "seconds": 0.0123}
+        except Exception as e:
+            results[name] = {"success": False, "error": str(e), "seconds": 0.0012}
+    return {"scenario": SCENARIO, "llm_features": stub_llm_features(SCENARIO), "llm_seconds": 0.5123,
+            "results": results, "failed": [name for name, outcome in results.items() if not outcome["success"]],
+            "total_seconds": 0.5321}
+
+
+def _batch(size=64):
+    scenarios = [f"{SCENARIO} #{i}" for i in range(size)]
+    outcomes = _predict("pretrained_temp_xbg", "predict_temp_batch", scenarios, [stub_llm_features(s) for s in scenarios])
+    return {"predictor": "temperature", "count": size, "succeeded": sum(o["success"] for o in outcomes),
+            "llm_seconds": 0.8123, "inference_seconds": 0.0042, "total_seconds": 0.8165,
+            "results": [dict(o, scenario=s) for s, o in zip(scenarios, outcomes)]}
+
+
+# name -> (route path, builder returning what the handler returns)
+PAYLOADS = {
+    "temperature": ("/temperature_prediction/", lambda: {"prediction": PREDICTIONS["temperature"]()}),
+    "humidity": ("/humidity_prediction/", lambda: {"prediction": PREDICTIONS["humidity"]()}),
+    "croprate": ("/predict_croprate", lambda: {"success": True, "result": PREDICTIONS["crop_yield"]()}),
+    "economic": ("/predict_economic_impact",
+                 lambda: {"message": "Prediction complete.", "scenario": SCENARIO,
+                          "predicted_economic_impact_million_usd": PREDICTIONS["economic_impact"]()}),
+    "ozone": ("/ozone_prediction/", lambda: {"prediction": PREDICTIONS["ozone"]()}),
+    "adaptation": ("/predict_adaptation",
+                   lambda: {"success": True, "predicted_adaptation_strategy": PREDICTIONS["adaptation"]()}),
+    "scenario": ("/scenario", _composite),
+    "batch_temperature_64": ("/batch_prediction/{predictor}", _batch),
+    "electricity_forecast": ("/electricity_forecast",
+                             lambda: {"start_time": "2025-06-01T00:00:00",
+                                      **_predict("electricity_store", "electricity_demand_horizons", datetime(2025, 6, 1))}),
+    "electricity_chart": ("/predict_electricity",
+                          lambda: _predict("pretrained_electricity", "electricity_demand_chart", datetime(2025, 6, 1))),
+    "sentiment": ("/analyze_sentimental_report",
+                  lambda: {"text": SCENARIO, "sentiment": "NEUTRAL", "score": 0.0}),
+}
+
+
+def _time_per_call(fn, min_seconds=0.2, repeats=5):
+    # Median over `repeats` rounds of enough calls to fill min_seconds
+    fn()
+    number, elapsed = 1, 0.0
+    while elapsed < min_seconds / repeats:
+        number *= 2
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+    rounds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - start) / number)
+    return statistics.median(rounds)
+
+
+def measure(name, route):
+    """
+    Serialization cost of one payload through:
+      previous: jsonable_encoder + json.dumps (FastAPI's default without a model)
+      current: response-model validation + dump_python + fast_json (allApi's path)
+      fast_json_only: fast_json.dumps on the raw payload
+      pydantic_dump_json: FastAPI's own model fast path, for reference
+    """
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    import fast_json
+
+    payload = PAYLOADS[name][1]()
+    field = route.response_field if route is not None else None
+    exclude_unset = bool(route and route.response_model_exclude_unset)
+
+    def previous():
+        return JSONResponse(content=jsonable_encoder(payload)).body
+
+    def current():
+        if field is None:
+            return fast_json.dumps(payload)
+        value, errors = field.validate(payload, {}, loc=("response",))
+        if errors:
+            raise ValueError(errors)
+        return fast_json.dumps(field.serialize(value, exclude_unset=exclude_unset))
+
+    def pydantic_dump_json():
+        value, _ = field.validate(payload, {}, loc=("response",))
+        return field.serialize_json(value, exclude_unset=exclude_unset)
+
+    methods = {"previous": previous, "current": current, "fast_json_only": lambda: fast_json.dumps(payload)}
+    if field is not None:
+        methods["pydantic_dump_json"] = pydantic_dump_json
+
+    result = {"route": PAYLOADS[name][0], "response_model": field is not None}
+    for method, fn in methods.items():
+        try:
+            body = fn()
+            result[method] = {"microseconds": round(_time_per_call(fn) * 1e6, 2), "bytes": len(body)}
+        except Exception as e:
+            # e.g. jsonable_encoder on np.float32
+            result[method] = {"error": f"{type(e).__name__}: {e}"[:200]}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response serialization per endpoint.")
+    parser.add_argument("payloads", nargs="*", help=f"subset of: {', '.join(PAYLOADS)}")
+    parser.add_argument("--output", help="results JSON (default: .benchmarks/serialization-<commit>.json)")
+    args = parser.parse_args()
+
+    names = args.payloads or list(PAYLOADS)
+    unknown = [name for name in names if name not in PAYLOADS]
+    if unknown:
+        parser.error(f"unknown payload(s): {', '.join(unknown)}")
+
+    import fast_json
+    from main import app
+    routes = {route.path: route for route in app.routes if hasattr(route, "response_field")}
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "json_backend": fast_json.BACKEND,
+        "payloads": {},
+    }
+
+    print(f"⏱️ Serialization per response ({fast_json.BACKEND}), microseconds")
+    print(f"  {'payload':<22} {'bytes':>8} {'previous':>12} {'current':>10} {'fast_json':>10} {'dump_json':>10}")
+    for name in names:
+        try:
+            result = measure(name, routes.get(PAYLOADS[name][0]))
+        except Exception as e:
+            report["payloads"][name] = {"error": str(e)}
+            print(f"  ❌ {name:<20} {e}")
+            continue
+        report["payloads"][name] = result
+        cell = lambda method: (f"{result[method]['microseconds']:10.1f}" if "microseconds" in result.get(method, {})
+                               else f"{'-' if method not in result else 'error':>10}")
+        size = result["current"].get("bytes", 0)
+        print(f"  {name:<22} {size:>8} {cell('previous'):>12} {cell('current')} {cell('fast_json_only')} "
+              f"{cell('pydantic_dump_json')}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"serialization-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import base64
+
+import numpy as np
+
+# Alternative to Plotly's fig.to_json() for the graph endpoints: only the
+# data, as typed columns, plus a small spec the frontend turns into a chart.
+#
+# {
+#   "format": "columnar/1",
+#   "encoding": "json" | "base64",
+#   "x": {"epoch": "2013-03-02T00:00:00", "unit": "D", "count": 1402,
+#         "step": 1}                       # regular series
+#         "offsets": [...]                 # otherwise, epoch + offset * unit
+#   "series": [{"name": ..., "dtype": "float32", "values": [...], "mode": ..., ...}],
+#   "title": ..., "x_title": ..., "y_title": ...,
+#   "annotations": [{"series": ..., "index": i, "text": ...}]
+# }
+#
+# With "base64", offsets are little-endian int32 and values little-endian
+# float32, base64-encoded; with "json" they are plain lists and values are
+# rounded to `precision` decimals (NaN becomes null).
+CHART_FORMAT = "columnar/1"
+ENCODINGS = ("json", "base64")
+
+# Coarsest first, so offsets stay small
+_UNITS = ("D", "h", "m", "s")
+
+
+def _b64(array, dtype):
+    return base64.b64encode(np.ascontiguousarray(array, dtype=dtype).tobytes()).decode("ascii")
+
+
+def encode_timestamps(timestamps, encoding="json"):
+    """
+    Sorted timestamps as an epoch, a unit and either a constant step or
+    per-point integer offsets from the epoch.
+    """
+    timestamps = np.asarray(timestamps, dtype="datetime64[ns]")
+    if len(timestamps) == 0:
+        return {"epoch": None, "unit": "s", "count": 0, "step": None}
+
+    epoch = timestamps[0]
+    deltas = timestamps - epoch
+    for unit in _UNITS:
+        if not (deltas % np.timedelta64(1, unit)).any():
+            break
+    offsets = (deltas // np.timedelta64(1, unit)).astype(np.int64)
+
+    encoded = {"epoch": str(epoch.astype("datetime64[s]")), "unit": unit, "count": len(offsets)}
+    steps = np.diff(offsets)
+    if len(steps) == 0 or (steps == steps[0]).all():
+        encoded["step"] = int(steps[0]) if len(steps) else 0
+    else:
+        encoded["step"] = None
+        encoded["offsets"] = _b64(offsets, "<i4") if encoding == "base64" else offsets.tolist()
+    return encoded
+
+
+def encode_values(values, encoding="json", precision=3):
+    values = np.asarray(values, dtype=np.float32)
+    if encoding == "base64":
+        return _b64(values, "<f4")
+    rounded = np.round(values.astype(np.float64), precision)
+    if np.isnan(rounded).any():
+        return [None if np.isnan(v) else v for v in rounded.tolist()]
+    return rounded.tolist()
+
+
+def chart_payload(x, series, title=None, x_title=None, y_title=None, annotations=None,
+                  encoding="json", precision=3):
+    """
+    Builds a columnar chart payload.
+
+    Args:
+        x (array-like): Shared datetime x values.
+        series (list): (name, values, style) tuples; style holds rendering
+            hints such as mode, color and dash.
+        annotations (list, optional): Dicts with "series", "index" (into x)
+            and "text".
+        encoding (str): "json" or "base64".
+        precision (int): Decimals kept for values in "json" encoding.
+
+    Returns:
+        dict: JSON-ready payload in the CHART_FORMAT layout.
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown encoding '{encoding}', expected one of: {', '.join(ENCODINGS)}")
+    return {
+        "format": CHART_FORMAT,
+        "encoding": encoding,
+        "x": encode_timestamps(x, encoding),
+        "series": [
+            {"name": name, "dtype": "float32", "values": encode_values(values, encoding, precision), **(style or {})}
+            for name, values, style in series
+        ],
+        "title": title,
+        "x_title": x_title,
+        "y_title": y_title,
+        "annotations": annotations or [],
+    }
+
+
+def decode_payload(payload):
+    """
+    Inverse of chart_payload, for tests and Python clients.
+
+    Returns:
+        tuple: (datetime64[s] x array, {series name: float32 values})
+    """
+    x = payload["x"]
+    if x["count"] == 0:
+        offsets = np.zeros(0, dtype=np.int64)
+    elif x["step"] is not None:
+        offsets = np.arange(x["count"], dtype=np.int64) * x["step"]
+    elif payload["encoding"] == "base64":
+        offsets = np.frombuffer(base64.b64decode(x["offsets"]), dtype="<i4").astype(np.int64)
+    else:
+        offsets = np.asarray(x["offsets"], dtype=np.int64)
+    epoch = np.datetime64(x["epoch"] or "1970-01-01T00:00:00", "s")
+    timestamps = epoch + offsets * np.timedelta64(1, x["unit"])
+
+    values = {}
+    for s in payload["series"]:
+        if payload["encoding"] == "base64":
+            values[s["name"]] = np.frombuffer(base64.b64decode(s["values"]), dtype="<f4")
+        else:
+            values[s["name"]] = np.asarray([np.nan if v is None else v for v in s["values"]], dtype=np.float32)
+    return timestamps, values
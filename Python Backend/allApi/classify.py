@@ -1,34 +1,31 @@
-import xgboost as xgb
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler, LabelEncoder
-import pandas as pd
-import os
-from sklearn.metrics import classification_report
 from LLM import run_climate_scenario_prediction 
+from batching import batch_predict
+from metrics import observe_stage
+from model_registry import get_model, get_preprocessing
 
-import cloudinary
-from cloudinary.utils import cloudinary_url
 
-print("Setting up Cloudinary for dataset access...")
-# Set up your Cloudinary credentials
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-    secure=True
-)
-print("Cloudinary configured successfully.")
+def adaptation_input_row(prediction, preprocessing):
+    input_features = np.array([
+        prediction["meantemp"],
+        prediction["Total_Precipitation_mm"],
+        prediction["CO2_Emissions_MT"],
+        prediction["Crop_Yield_MT_per_HA"],
+        prediction["Pesticide_Use_KG_per_HA"],
+        prediction["Fertilizer_Use_KG_per_HA"],
+        prediction["Soil_Health_Index"]
+    ]).reshape(1, -1)
 
-csv_url = os.getenv("CLIMATE_CHANGE_IMPACT_ON_AGICULTURE_2024")
-csvfile_url, _ = cloudinary_url(csv_url, resource_type="raw")
+    return preprocessing.transform(input_features)
 
 
-def classify_adaptation(scenario: str) -> str:
+def classify_adaptation(scenario: str, features: dict = None) -> str:
     """
     Classifies adaptation strategy based on a user-defined climate scenario.
 
     Args:
         scenario (str): The user-defined climate scenario description.
+        features (dict, optional): LLM features already extracted for the scenario.
 
     Returns:
         str: The predicted adaptation strategy.
@@ -37,72 +34,46 @@ def classify_adaptation(scenario: str) -> str:
     # ====================================
     # LLM-Based Scenario Input
     # ====================================
-    prediction = run_climate_scenario_prediction(scenario)
+    prediction = features if features is not None else run_climate_scenario_prediction(scenario)
 
     # ====================================
-    # Paths
+    # Scaler & Label Classes (built by preprocessing.py)
     # ====================================
-    base_path = os.path.dirname(__file__)
-    file_path = csvfile_url
-    model_path = os.path.join(base_path, 'pretrained_adaptation_classifier.json')
+    preprocessing = get_preprocessing("adaptation")
 
     # ====================================
-    # Dataset & Label Encoding
+    # Model (shared from the registry)
     # ====================================
-    df = pd.read_csv(file_path)
-    label_encoder = LabelEncoder()
-    df['Adaptation_Strategies_Encoded'] = label_encoder.fit_transform(df['Adaptation_Strategies'])
-
-    feature_columns = [
-        'Average_Temperature_C', 'Total_Precipitation_mm', 'CO2_Emissions_MT',
-        'Crop_Yield_MT_per_HA', 'Pesticide_Use_KG_per_HA',
-        'Fertilizer_Use_KG_per_HA', 'Soil_Health_Index'
-    ]
-
-    X_all = df[feature_columns].values
-    y = df['Adaptation_Strategies_Encoded'].values
+    model = get_model("adaptation")
 
     # ====================================
-    # Scaling & Test Split
+    # Predict LLM Scenario
     # ====================================
-    scaler = MinMaxScaler()
-    X_scaled = scaler.fit_transform(X_all)
-    split = int(0.8 * len(X_scaled))
-    X_test = X_scaled[split:]
-    y_test = y[split:]
+    with observe_stage("preprocessing", "adaptation"):
+        scaled_input = adaptation_input_row(prediction, preprocessing)
+    with observe_stage("inference", "adaptation"):
+        encoded_pred = model.predict(scaled_input)
+    final_strategy = str(preprocessing.classes[encoded_pred[0]])
 
-    # ====================================
-    # Load Model
-    # ====================================
-    model = xgb.XGBClassifier()
-    model.load_model(model_path)
+    print(f"🌍 Predicted Adaptation Strategy (LLM Scenario): {final_strategy}")
+    return final_strategy
 
-    # ====================================
-    # Evaluate on Test Data
-    # ====================================
-    y_pred = model.predict(X_test)
-    y_pred_labels = label_encoder.inverse_transform(y_pred)
-    y_test_labels = label_encoder.inverse_transform(y_test)
 
-    print(f"🧪 Latest Predicted Adaptation Strategy (from test data): {y_pred_labels[-1]}")
-    print(classification_report(y_test_labels, y_pred_labels))
+def classify_adaptation_batch(scenarios: list, features_list: list) -> list:
+    """
+    Classifies many scenarios with a single model.predict call.
 
-    # ====================================
-    # Predict LLM Scenario
-    # ====================================
-    input_features = np.array([
-        prediction["meantemp"],
-        prediction["Total_Precipitation_mm"],
-        prediction["CO2_Emissions_MT"],
-        prediction["Crop_Yield_MT_per_HA"],
-        prediction["Pesticide_Use_KG_per_HA"],
-        prediction["Fertilizer_Use_KG_per_HA"],
-        prediction["Soil_Health_Index"]
-    ]).reshape(1, -1)
+    Args:
+        scenarios (list): The scenario descriptions.
+        features_list (list): LLM features already extracted for each scenario.
 
-    scaled_input = scaler.transform(input_features)
-    encoded_pred = model.predict(scaled_input)
-    final_strategy = label_encoder.inverse_transform(encoded_pred)[0]
+    Returns:
+        list: One outcome dict per scenario (see batching.batch_predict).
+    """
+    preprocessing = get_preprocessing("adaptation")
+    model = get_model("adaptation")
 
-    print(f"🌍 Predicted Adaptation Strategy (LLM Scenario): {final_strategy}")
-    return final_strategy
+    def predict_rows(X, indices):
+        return [str(preprocessing.classes[code]) for code in model.predict(X)]
+
+    return batch_predict(features_list, lambda f: adaptation_input_row(f, preprocessing), predict_rows, component="adaptation")
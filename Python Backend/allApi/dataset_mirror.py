@@ -0,0 +1,268 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+base_path = os.path.dirname(__file__)
+
+# Where downloaded copies live; outside the repo in production if wanted
+CACHE_DIR = os.getenv("DATASET_CACHE_DIR", os.path.join(base_path, ".dataset_cache"))
+# A cached copy older than this is served as-is and revalidated in the background
+REVALIDATE_SECONDS = float(os.getenv("DATASET_REVALIDATE_SECONDS", "3600"))
+DOWNLOAD_TIMEOUT_SECONDS = float(os.getenv("DATASET_DOWNLOAD_TIMEOUT_SECONDS", "30"))
+# After a failed download, no new attempt is made for this long
+RETRY_SECONDS = float(os.getenv("DATASET_RETRY_SECONDS", "300"))
+
+# ====================================
+# Mirrored datasets
+# ====================================
+# name -> env var holding the Cloudinary public id / URL, and the bundled fallback copy
+DATASETS = {
+    "DailyDelhiClimateTrain": {
+        "env": "DailyDelhiClimateTrain",
+        "bundled": os.path.join("Datasets", "DailyDelhiClimateTrain.csv"),
+    },
+    "climate_change_impact_on_agriculture_2024": {
+        "env": "CLIMATE_CHANGE_IMPACT_ON_AGICULTURE_2024",
+        "bundled": os.path.join("Datasets", "climate_change_impact_on_agriculture_2024.csv"),
+    },
+}
+
+_lock = threading.Lock()
+_refreshing = set()
+_verified = {}
+_stats = {}
+_resolved = {}  # name -> (local path, time after which it is looked up again)
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_paths(name):
+    return os.path.join(CACHE_DIR, f"{name}.csv"), os.path.join(CACHE_DIR, f"{name}.meta.json")
+
+
+def _read_meta(name):
+    _, meta_path = _cache_paths(name)
+    try:
+        with open(meta_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(name, meta):
+    _, meta_path = _cache_paths(name)
+    tmp_path = meta_path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def _has_remote(name):
+    return bool(os.getenv(DATASETS[name]["env"]))
+
+
+def _remote_url(name):
+    public_id = os.getenv(DATASETS[name]["env"])
+    if not public_id:
+        return None
+    if public_id.startswith(("http://", "https://")):
+        return public_id
+
+    import cloudinary
+    from cloudinary.utils import cloudinary_url
+
+    cloudinary.config(
+        cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
+        api_key=os.getenv("CLOUDINARY_API_KEY"),
+        api_secret=os.getenv("CLOUDINARY_API_SECRET"),
+        secure=True
+    )
+    url, _ = cloudinary_url(public_id, resource_type="raw")
+    return url
+
+
+def _stat(name):
+    return _stats.setdefault(name, {
+        "served_from": None, "downloads": 0, "not_modified": 0, "failures": 0, "last_error": None,
+        "last_failure_at": None,
+    })
+
+
+def _backing_off(name):
+    failed_at = _stat(name)["last_failure_at"]
+    return failed_at is not None and time.time() - failed_at < RETRY_SECONDS
+
+
+def refresh(name):
+    """
+    Revalidates the cached copy of `name` with a conditional GET and replaces
+    it atomically when the remote changed. Returns True when a new copy was
+    stored. Failures are recorded and never raised.
+    """
+    url = _remote_url(name)
+    if url is None:
+        return False
+
+    csv_path, _ = _cache_paths(name)
+    # Only revalidate a copy that passes its checksum; otherwise fetch it again
+    _, meta = _valid_cached_copy(name)
+    request = urllib.request.Request(url)
+    if meta and meta.get("etag"):
+        request.add_header("If-None-Match", meta["etag"])
+    if meta and meta.get("last_modified"):
+        request.add_header("If-Modified-Since", meta["last_modified"])
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT_SECONDS) as response:
+            tmp_path = csv_path + ".download"
+            with open(tmp_path, 'wb') as f:
+                for chunk in iter(lambda: response.read(1 << 20), b''):
+                    f.write(chunk)
+            headers = response.headers
+
+        if os.path.getsize(tmp_path) == 0:
+            os.remove(tmp_path)
+            raise ValueError("empty download")
+
+        sha256 = _sha256(tmp_path)
+        os.replace(tmp_path, csv_path)
+        _write_meta(name, {
+            "url": url,
+            "sha256": sha256,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "checked_at": time.time(),
+        })
+        with _lock:
+            _verified[name] = sha256
+            _stat(name)["downloads"] += 1
+            _stat(name)["last_failure_at"] = None
+            _resolved.pop(name, None)
+        print(f"✅ Mirrored dataset '{name}' ({sha256[:12]})")
+        return True
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and meta:
+            meta["checked_at"] = time.time()
+            _write_meta(name, meta)
+            with _lock:
+                _stat(name)["not_modified"] += 1
+                _stat(name)["last_failure_at"] = None
+                _resolved.pop(name, None)
+            return False
+        error = e
+    except Exception as e:
+        error = e
+
+    with _lock:
+        _stat(name)["failures"] += 1
+        _stat(name)["last_error"] = str(error)
+        _stat(name)["last_failure_at"] = time.time()
+    print(f"⚠️ Could not refresh dataset '{name}': {error}")
+    return False
+
+
+def _refresh_in_background(name):
+    # Nothing to fetch without a remote, and no retry storm while it is down
+    if not _has_remote(name):
+        return
+    with _lock:
+        if name in _refreshing or _backing_off(name):
+            return
+        _refreshing.add(name)
+
+    def run():
+        try:
+            refresh(name)
+        finally:
+            with _lock:
+                _refreshing.discard(name)
+
+    threading.Thread(target=run, name=f"dataset-refresh-{name}", daemon=True).start()
+
+
+def _valid_cached_copy(name):
+    csv_path, _ = _cache_paths(name)
+    meta = _read_meta(name)
+    if meta is None or not os.path.exists(csv_path):
+        return None, None
+
+    # Checksum verified once per process (and after every download)
+    if _verified.get(name) != meta["sha256"]:
+        if _sha256(csv_path) != meta["sha256"]:
+            print(f"⚠️ Cached dataset '{name}' failed checksum validation; ignoring it")
+            return None, None
+        with _lock:
+            _verified[name] = meta["sha256"]
+    return csv_path, meta
+
+
+def dataset_path(name):
+    """
+    Local path of dataset `name`, never waiting on the network when a copy is
+    available: the validated mirror copy if present, otherwise the bundled
+    Datasets/ copy. Missing or stale mirror copies are (re)fetched in the
+    background.
+
+    Args:
+        name (str): One of DATASETS.
+
+    Returns:
+        str: Path to a local CSV file.
+    """
+    # Resolved once per refresh interval, so per-request callers (the graph
+    # and metrics fingerprints) don't re-read the mirror metadata every time
+    now = time.time()
+    resolved = _resolved.get(name)
+    if resolved is not None and now < resolved[1]:
+        return resolved[0]
+
+    csv_path, meta = _valid_cached_copy(name)
+    revalidate_at = meta.get("checked_at", 0) + REVALIDATE_SECONDS if meta else now
+    if csv_path is None or now > revalidate_at:
+        _refresh_in_background(name)
+    # Looked up again when the copy is due for revalidation, or once the
+    # retry window of a background refresh has passed (a finished refresh
+    # drops the entry right away)
+    next_lookup = revalidate_at if now < revalidate_at else now + RETRY_SECONDS
+
+    if csv_path is not None:
+        _stat(name)["served_from"] = "mirror"
+        _resolved[name] = (csv_path, next_lookup)
+        return csv_path
+
+    bundled_path = os.path.join(base_path, DATASETS[name]["bundled"])
+    if os.path.exists(bundled_path):
+        _stat(name)["served_from"] = "bundled"
+        _resolved[name] = (bundled_path, next_lookup if _has_remote(name) else float("inf"))
+        return bundled_path
+
+    # Nothing local at all: this is the only case that blocks on a download
+    if _has_remote(name) and not _backing_off(name) and refresh(name):
+        _stat(name)["served_from"] = "mirror"
+        return _cache_paths(name)[0]
+    raise FileNotFoundError(f"Dataset '{name}' is not available locally and could not be downloaded")
+
+
+def warm_datasets():
+    # Called at startup: validates local copies and revalidates them in the background
+    for name in DATASETS:
+        try:
+            dataset_path(name)
+        except FileNotFoundError as e:
+            print(f"⚠️ {e}")
+
+
+def mirror_stats():
+    with _lock:
+        return {name: dict(_stat(name), refreshing=name in _refreshing) for name in DATASETS}
@@ -0,0 +1,296 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+base_path = os.path.dirname(__file__)
+
+ELECTRICITY_DATASET = os.path.join(base_path, 'Datasets', '2025 testset.csv')
+
+# Model input columns, in the order the electricity booster was trained on
+ELECTRICITY_FEATURES = ['day_of_week', 'hour_of_day', 'is_weekend', 'temperature', 'is_holiday', 'solar_generation']
+
+
+class HourlyStore:
+    """
+    The hourly electricity table held as timestamp-sorted NumPy columns, with
+    the calendar features precomputed. Windows are located with two binary
+    searches and returned as views, so a query never parses or scans.
+    """
+
+    def __init__(self, timestamps, columns):
+        order = np.argsort(timestamps, kind="stable")
+        self.timestamps = np.asarray(timestamps, dtype="datetime64[ns]")[order]
+        self.columns = {name: np.asarray(values)[order] for name, values in columns.items()}
+
+        # Calendar features from the timestamp, like the training script
+        days = self.timestamps.astype("datetime64[D]")
+        self.columns["day_of_week"] = ((days.astype(np.int64) + 3) % 7).astype(np.int64)  # 1970-01-01 was a Thursday
+        self.columns["hour_of_day"] = ((self.timestamps - days) // np.timedelta64(1, "h")).astype(np.int64)
+        self.columns["is_weekend"] = (self.columns["day_of_week"] >= 5).astype(np.int64)
+
+        for values in self.columns.values():
+            values.setflags(write=False)
+        self.timestamps.setflags(write=False)
+
+    @classmethod
+    def from_csv(cls, path=ELECTRICITY_DATASET):
+        import pandas as pd
+
+        df = pd.read_csv(path, parse_dates=['timestamp'])
+        columns = {
+            name: df[name].to_numpy()
+            for name in df.columns
+            if name not in ('timestamp', 'day_of_week', 'hour_of_day', 'is_weekend')
+        }
+        return cls(df['timestamp'].to_numpy(dtype="datetime64[ns]"), columns)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def start(self):
+        return self.timestamps[0].astype("datetime64[s]") if len(self) else None
+
+    @property
+    def end(self):
+        return self.timestamps[-1].astype("datetime64[s]") if len(self) else None
+
+    def range_indices(self, start, end):
+        """
+        Row positions [lo, hi) of the rows with start <= timestamp < end.
+        """
+        lo, hi = np.searchsorted(
+            self.timestamps, [np.datetime64(start, "ns"), np.datetime64(end, "ns")], side="left"
+        )
+        return int(lo), int(hi)
+
+    def window(self, start, end=None, hours=24):
+        """
+        Every column for start <= timestamp < end (default: `hours` after
+        start), as read-only views.
+
+        Returns:
+            dict: "timestamp" plus one array per column.
+        """
+        start = np.datetime64(start, "ns")
+        end = np.datetime64(end, "ns") if end is not None else start + np.timedelta64(int(hours * 3600), "s")
+        lo, hi = self.range_indices(start, end)
+        window = {name: values[lo:hi] for name, values in self.columns.items()}
+        window["timestamp"] = self.timestamps[lo:hi]
+        return window
+
+    def feature_matrix(self, window, features=ELECTRICITY_FEATURES):
+        # float32 like XGBoost's DMatrix
+        return np.column_stack([window[name] for name in features]).astype(np.float32)
+
+
+# Resolution -> (bucket unit, buckets served), i.e. the next 24 hours,
+# 30 days and 12 months
+HORIZONS = {"hourly": ("h", 24), "daily": ("D", 30), "monthly": ("M", 12)}
+
+
+class DemandLevel:
+    """
+    One level of the aggregation pyramid: predicted demand bucketed by hour,
+    day or month, with each bucket's total, mean, peak and lowest hour and
+    the number of hours it covers.
+    """
+
+    def __init__(self, unit, start, first_row, hours, total, peak, lowest):
+        self.unit = unit
+        self.start = start.astype("datetime64[ns]")
+        self.first_row = first_row
+        self.hours = hours
+        self.total = total
+        self.mean = total / hours
+        self.peak = peak
+        self.lowest = lowest
+
+    @classmethod
+    def from_hours(cls, timestamps, predicted):
+        # Base level: one bucket per hour of the dataset
+        start, first_row, hours = np.unique(timestamps.astype("datetime64[h]"), return_index=True, return_counts=True)
+        return cls("h", start, first_row, hours, np.add.reduceat(predicted.astype(np.float64), first_row),
+                   np.maximum.reduceat(predicted, first_row), np.minimum.reduceat(predicted, first_row))
+
+    def coarsen(self, unit):
+        """
+        The next level up, aggregated from this level's buckets rather than
+        from the raw hours.
+        """
+        start, groups = np.unique(self.start.astype(f"datetime64[{unit}]"), return_index=True)
+        return DemandLevel(unit, start, self.first_row[groups], np.add.reduceat(self.hours, groups),
+                           np.add.reduceat(self.total, groups), np.maximum.reduceat(self.peak, groups),
+                           np.minimum.reduceat(self.lowest, groups))
+
+    def range(self, start, count):
+        """
+        `count` buckets starting with the one containing `start`.
+        """
+        first = np.datetime64(start, self.unit)
+        bounds = np.array([first, first + np.timedelta64(count, self.unit)]).astype("datetime64[ns]")
+        lo, hi = np.searchsorted(self.start, bounds, side="left")
+        return {"timestamp": self.start[lo:hi], "total": self.total[lo:hi], "mean": self.mean[lo:hi],
+                "peak": self.peak[lo:hi], "lowest": self.lowest[lo:hi], "hours": self.hours[lo:hi]}
+
+
+class DemandForecast:
+    """
+    Predicted demand for every hour of the store, computed in one batch, plus
+    each calendar day's peak and trough and the hourly/daily/monthly
+    aggregation pyramid. Serving a window or a horizon is a slice.
+    """
+
+    def __init__(self, store, predicted):
+        self.store = store
+        self.predicted = np.asarray(predicted, dtype=np.float32)
+        self.predicted.setflags(write=False)
+
+        hourly = DemandLevel.from_hours(store.timestamps, self.predicted)
+        daily = hourly.coarsen("D")
+        self.levels = {"hourly": hourly, "daily": daily, "monthly": daily.coarsen("M")}
+
+        # Days are contiguous runs of the sorted timestamps
+        self.days = daily.start.astype("datetime64[D]")
+        self.day_starts, self.day_lengths = daily.first_row, daily.hours
+        self.day_peak_index = self._first_match(np.maximum.reduceat(self.predicted, self.day_starts))
+        self.day_trough_index = self._first_match(np.minimum.reduceat(self.predicted, self.day_starts))
+
+    def _first_match(self, day_values):
+        # Row of the first hour in each day reaching that day's value, like argmax/argmin
+        day_ids = np.repeat(np.arange(len(self.days)), self.day_lengths)
+        rows = np.flatnonzero(self.predicted == np.repeat(day_values, self.day_lengths))
+        _, first = np.unique(day_ids[rows], return_index=True)
+        return rows[first]
+
+    def window(self, start, end=None, hours=24):
+        """
+        Timestamps and predictions for start <= timestamp < end, with the
+        rows of the window's peak and trough.
+
+        Returns:
+            dict: timestamp, predicted_demand, peak and lowest (row offsets
+                into the window, None for an empty window).
+        """
+        start = np.datetime64(start, "ns")
+        end = np.datetime64(end, "ns") if end is not None else start + np.timedelta64(int(hours * 3600), "s")
+        lo, hi = self.store.range_indices(start, end)
+        predicted = self.predicted[lo:hi]
+        day = np.searchsorted(self.day_starts, lo)
+        if hi == lo:
+            peak = lowest = None
+        elif day < len(self.days) and self.day_starts[day] == lo and lo + self.day_lengths[day] == hi:
+            # Exactly one calendar day: use the precomputed extremes
+            peak, lowest = int(self.day_peak_index[day]) - lo, int(self.day_trough_index[day]) - lo
+        else:
+            peak, lowest = int(np.argmax(predicted)), int(np.argmin(predicted))
+        return {"timestamp": self.store.timestamps[lo:hi], "predicted_demand": predicted,
+                "peak": peak, "lowest": lowest}
+
+    def horizons(self, start):
+        # Every resolution in HORIZONS, each from the bucket containing `start`
+        return {name: self.levels[name].range(start, count) for name, (_, count) in HORIZONS.items()}
+
+    def daily_extremes(self):
+        return {
+            "day": self.days,
+            "peak_timestamp": self.store.timestamps[self.day_peak_index],
+            "peak_demand": self.predicted[self.day_peak_index],
+            "lowest_timestamp": self.store.timestamps[self.day_trough_index],
+            "lowest_demand": self.predicted[self.day_trough_index],
+        }
+
+
+# ====================================
+# Shared instances, rebuilt when the dataset or model file changes
+# ====================================
+_lock = threading.Lock()
+_store = {"signature": None, "store": None}
+_forecast = {"key": None, "forecast": None}
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _model_path():
+    from model_registry import MODEL_ARTIFACTS
+    return os.path.join(base_path, MODEL_ARTIFACTS["electricity"][1][0])
+
+
+def get_store():
+    # Loaded once per process, on first use or from main's warm-up
+    signature = _signature(ELECTRICITY_DATASET)
+    if _store["signature"] != signature:
+        with _lock:
+            if _store["signature"] != signature:
+                store = HourlyStore.from_csv()
+                _store.update(signature=signature, store=store)
+                print(f"✅ Loaded {len(store)} hourly electricity rows ({store.start} to {store.end})")
+    return _store["store"]
+
+
+def get_forecast():
+    """
+    The shared DemandForecast, predicted in one pass over the whole store on
+    first use and again whenever the dataset or the model artifact changes.
+    """
+    from metrics import observe_stage
+    from model_registry import get_model, reload_model
+
+    store = get_store()
+    model_signature = _signature(_model_path())
+    key = (id(store), model_signature)
+    if _forecast["key"] == key:
+        return _forecast["forecast"]
+
+    with _lock:
+        if _forecast["key"] != key:
+            previous = _forecast["key"]
+            model = reload_model("electricity") if previous and previous[1] != model_signature else get_model("electricity")
+            with observe_stage("inference", "electricity"):
+                start = time.perf_counter()
+                forecast = DemandForecast(store, model.predict(store.feature_matrix(store.columns)))
+            _forecast.update(key=key, forecast=forecast)
+            print(f"✅ Forecast {len(store)} hours of electricity demand in {time.perf_counter() - start:.3f}s")
+    return _forecast["forecast"]
+
+
+# ====================================
+# Horizons served by /electricity_forecast
+# ====================================
+HORIZON_TITLES = {
+    "hourly": "Next 24 Hours Electricity Demand Forecast",
+    "daily": "Next 30 Days Electricity Demand Forecast",
+    "monthly": "Next 12 Months Electricity Demand Forecast",
+}
+
+
+def electricity_demand_horizons(start_datetime):
+    """
+    Next 24 hours hourly, next 30 days daily and next 12 months monthly, all
+    sliced from the forecast's aggregation pyramid (the served counterpart
+    of analysis.plot_electricity_forecasts), without importing plotly.
+
+    Returns:
+        dict: One entry per resolution with bucket start timestamps and the
+            total, mean, peak and lowest predicted demand and hours covered.
+    """
+    from metrics import observe_stage
+
+    with observe_stage("dataset_load", "electricity_horizons"):
+        forecast = get_forecast()
+
+    horizons = {}
+    with observe_stage("serialization", "electricity_horizons"):
+        for name, levels in forecast.horizons(start_datetime).items():
+            horizons[name] = {
+                "title": HORIZON_TITLES[name],
+                "bucket": HORIZONS[name][0],
+                "timestamp": np.datetime_as_string(levels["timestamp"].astype("datetime64[s]")).tolist(),
+                **{column: levels[column].tolist() for column in ("total", "mean", "peak", "lowest", "hours")},
+            }
+    return horizons
@@ -0,0 +1,109 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def _init_process_worker():
+    # Each worker process needs its own copy of the models
+    import model_registry
+    model_registry.load_all()
+
+
+class InstrumentedExecutor:
+    """
+    Wraps a thread or process pool so async endpoints can await work on it,
+    keeping counters on in-flight, queued and completed jobs.
+    """
+
+    def __init__(self, name, kind="thread", max_workers=None):
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.max_workers, initializer=_init_process_worker
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers, thread_name_prefix=f"{self.name}-pool"
+                        )
+        return self._executor
+
+    async def run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            result = await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        else:
+            with self._lock:
+                self.completed += 1
+            return result
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "in_flight": self.in_flight,
+                # jobs waiting for a free worker
+                "queue_depth": max(self.in_flight - self.max_workers, 0),
+                "max_in_flight": self.max_in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# ====================================
+# Shared pools
+# ====================================
+# CPU-bound numeric work (pandas, scaling, model.predict). CPU_POOL_KIND=process
+# moves it out of the API process entirely.
+cpu_executor = InstrumentedExecutor(
+    "cpu",
+    kind=os.getenv("CPU_POOL_KIND", "thread"),
+    max_workers=int(os.getenv("CPU_POOL_WORKERS", "0")) or None,
+)
+
+# Blocking LLM network calls; mostly idle waiting so it can be much wider.
+llm_executor = InstrumentedExecutor(
+    "llm",
+    kind="thread",
+    max_workers=int(os.getenv("LLM_POOL_WORKERS", "32")),
+)
+
+
+def executor_stats():
+    return {"cpu": cpu_executor.stats(), "llm": llm_executor.stats()}
+
+
+def shutdown_executors():
+    cpu_executor.shutdown()
+    llm_executor.shutdown()
@@ -1,6 +1,8 @@
 from langchain_groq import ChatGroq
 from langchain_core.messages import SystemMessage, HumanMessage
+import asyncio
 import os
+import llm_replay
 from dotenv import load_dotenv
 
 # Load .env file
@@ -12,24 +14,50 @@ load_dotenv()
 # Initialize LLaMA 3 via Groq
 llm = ChatGroq(
     model_name="llama3-70b-8192",  # or "llama3-8b-8192"
-    api_key=os.getenv("GROQ_API_KEY")
+    api_key=os.getenv("GROQ_API_KEY"),
+    base_url=os.getenv("GROQ_BASE_URL")  # e.g. llm_stub_server.py for load tests; unset means Groq
 )
 
-def explain_planetary_what_if(question: str):
-    system_prompt = (
-        "You are a planetary science expert. When given a 'What if...' scenario, "
-        "respond with a rich, detailed explanation grounded in planetary science, "
-        "including the effects on Earth’s climate — such as the impact on seas, oceans, land, and atmosphere. "
-        "Use astrophysics and scientific speculation. Make it understandable to curious readers."
-    )
+# Upper bound for one narrative generation on the async path
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
 
-    messages = [
-        SystemMessage(content=system_prompt),
+PLANETARY_SYSTEM_PROMPT = (
+    "You are a planetary science expert. When given a 'What if...' scenario, "
+    "respond with a rich, detailed explanation grounded in planetary science, "
+    "including the effects on Earth’s climate — such as the impact on seas, oceans, land, and atmosphere. "
+    "Use astrophysics and scientific speculation. Make it understandable to curious readers."
+)
+PLANETARY_PROMPT_ID = llm_replay.prompt_id(PLANETARY_SYSTEM_PROMPT)
+
+def build_planetary_messages(question: str):
+    return [
+        SystemMessage(content=PLANETARY_SYSTEM_PROMPT),
         HumanMessage(content=question)
     ]
 
-    response = llm.invoke(messages)
-    return response.content
+def explain_planetary_what_if(question: str):
+    return llm_replay.invoke(
+        "planetary", PLANETARY_PROMPT_ID, question, lambda: llm.invoke(build_planetary_messages(question)).content
+    )
+
+async def explain_planetary_what_if_async(question: str, timeout: float = None):
+    # Non-blocking variant for async endpoints; raises asyncio.TimeoutError after `timeout`
+    timeout = timeout or LLM_TIMEOUT_SECONDS
+    async def generate():
+        response = await llm.ainvoke(build_planetary_messages(question))
+        return response.content
+
+    return await asyncio.wait_for(llm_replay.ainvoke("planetary", PLANETARY_PROMPT_ID, question, generate), timeout)
+
+async def stream_planetary_what_if(question: str):
+    # Yields the answer text chunk by chunk as the model generates it
+    async def generate():
+        async for chunk in llm.astream(build_planetary_messages(question)):
+            if chunk.content:
+                yield chunk.content
+
+    async for text in llm_replay.astream("planetary", PLANETARY_PROMPT_ID, question, generate):
+        yield text
 
 # Example
 if __name__ == "__main__":
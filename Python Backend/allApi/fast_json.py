@@ -0,0 +1,87 @@
+import datetime
+import json
+import sys
+
+from fastapi.responses import JSONResponse
+
+# orjson when installed (much faster, serializes NumPy natively), the
+# standard library otherwise; both go through the same NumPy-aware default
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _numpy():
+    # NumPy objects can only exist once numpy was imported by someone else,
+    # so main does not pay for the import
+    return sys.modules.get("numpy")
+
+
+def to_builtin(obj):
+    """
+    Recursively converts NumPy scalars and arrays (and pandas timestamps)
+    inside dicts, lists and tuples into plain Python values.
+    """
+    if isinstance(obj, dict):
+        return {key: to_builtin(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_builtin(value) for value in obj]
+    np = _numpy()
+    if np is not None and isinstance(obj, (np.generic, np.ndarray)):
+        return _default(obj)
+    return obj
+
+
+def _default(obj):
+    np = _numpy()
+    if np is not None:
+        if isinstance(obj, np.ndarray):
+            # orjson only handles C-contiguous arrays of native types itself
+            if obj.dtype.kind in "Mm":
+                return [str(v) for v in obj]
+            return to_builtin(obj.tolist())
+        if isinstance(obj, (np.datetime64, np.timedelta64)):
+            return str(obj)
+        if isinstance(obj, np.generic):
+            return obj.item()
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()  # pandas Timestamp is a datetime subclass
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _nan_to_none(obj):
+    # orjson writes NaN/Infinity as null; keep the stdlib path consistent
+    if isinstance(obj, float) and (obj != obj or obj in (float("inf"), float("-inf"))):
+        return None
+    if isinstance(obj, dict):
+        return {key: _nan_to_none(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_nan_to_none(value) for value in obj]
+    return obj
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(content) -> bytes:
+        return orjson.dumps(content, default=_default, option=_OPTIONS)
+else:
+    def dumps(content) -> bytes:
+        try:
+            return json.dumps(content, default=_default, ensure_ascii=False, allow_nan=False,
+                              separators=(",", ":")).encode("utf-8")
+        except ValueError:
+            return dumps(_nan_to_none(to_builtin(content)))
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with `dumps`: NumPy values need no conversion by
+    the handlers, and NaN becomes null instead of an error.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
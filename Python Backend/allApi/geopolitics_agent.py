@@ -1,6 +1,8 @@
 from langchain_groq import ChatGroq
 from langchain_core.messages import SystemMessage, HumanMessage
+import asyncio
 import os
+import llm_replay
 from dotenv import load_dotenv
 
 # === Load environment variables ===
@@ -11,27 +13,54 @@ load_dotenv()
 # === Initialize LLaMA 3 model via Groq ===
 llm = ChatGroq(
     model_name="llama3-70b-8192",  # or "llama3-8b-8192"
-    api_key=os.environ["GROQ_API_KEY"]
+    api_key=os.getenv("GROQ_API_KEY"),
+    base_url=os.getenv("GROQ_BASE_URL")  # e.g. llm_stub_server.py for load tests; unset means Groq
 )
 
 
+# Upper bound for one narrative generation on the async path
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+
+
 # === Geopolitical Analyst Agent ===
-def explain_geopolitical_what_if(question: str):
-    system_prompt = (
-        "You are a geopolitical analyst. When given a 'What if...' scenario, "
-        "analyze the global political, economic, and social consequences in depth. "
-        "Cover effects on international relations, governments, conflicts, migration, economies, "
-        "alliances, and global power structures. Use speculative reasoning based on historical and modern geopolitics. "
-        "Make the answer insightful and accessible to general readers."
-    )
+GEOPOLITICAL_SYSTEM_PROMPT = (
+    "You are a geopolitical analyst. When given a 'What if...' scenario, "
+    "analyze the global political, economic, and social consequences in depth. "
+    "Cover effects on international relations, governments, conflicts, migration, economies, "
+    "alliances, and global power structures. Use speculative reasoning based on historical and modern geopolitics. "
+    "Make the answer insightful and accessible to general readers."
+)
+GEOPOLITICAL_PROMPT_ID = llm_replay.prompt_id(GEOPOLITICAL_SYSTEM_PROMPT)
 
-    messages = [
-        SystemMessage(content=system_prompt),
+def build_geopolitical_messages(question: str):
+    return [
+        SystemMessage(content=GEOPOLITICAL_SYSTEM_PROMPT),
         HumanMessage(content=question)
     ]
 
-    response = llm.invoke(messages)
-    return response.content
+def explain_geopolitical_what_if(question: str):
+    return llm_replay.invoke(
+        "geopolitical", GEOPOLITICAL_PROMPT_ID, question, lambda: llm.invoke(build_geopolitical_messages(question)).content
+    )
+
+async def explain_geopolitical_what_if_async(question: str, timeout: float = None):
+    # Non-blocking variant for async endpoints; raises asyncio.TimeoutError after `timeout`
+    timeout = timeout or LLM_TIMEOUT_SECONDS
+    async def generate():
+        response = await llm.ainvoke(build_geopolitical_messages(question))
+        return response.content
+
+    return await asyncio.wait_for(llm_replay.ainvoke("geopolitical", GEOPOLITICAL_PROMPT_ID, question, generate), timeout)
+
+async def stream_geopolitical_what_if(question: str):
+    # Yields the answer text chunk by chunk as the model generates it
+    async def generate():
+        async for chunk in llm.astream(build_geopolitical_messages(question)):
+            if chunk.content:
+                yield chunk.content
+
+    async for text in llm_replay.astream("geopolitical", GEOPOLITICAL_PROMPT_ID, question, generate):
+        yield text
 
 # === Main execution for testing ===
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+
+from scenario_cache import normalize_scenario
+
+base_path = os.path.dirname(__file__)
+
+# live: call Groq. record: call Groq and append every response to the log.
+# replay: answer from the log only, never touching the network.
+LLM_MODE = os.getenv("LLM_MODE", "live").lower()
+LLM_LOG_PATH = os.getenv("LLM_LOG_PATH", os.path.join(base_path, ".llm_log", "llm_calls.jsonl"))
+# "recorded" waits as long as the original call took, "zero" answers immediately
+LLM_REPLAY_LATENCY = os.getenv("LLM_REPLAY_LATENCY", "recorded").lower()
+
+_lock = threading.Lock()
+_index = None
+_stats = {"recorded": 0, "replayed": 0, "replay_misses": 0}
+# prompt id -> full prompt text, filled by prompt_id()
+_prompt_texts = {}
+
+
+def prompt_id(prompt: str) -> str:
+    # Short fingerprint of a prompt, so editing a prompt never replays stale answers.
+    # The text itself is remembered so record() can log it next to the id.
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+    _prompt_texts[digest] = prompt
+    return digest
+
+
+def _key(kind, prompt, scenario):
+    return f"{kind}|{prompt}|{normalize_scenario(scenario)}"
+
+
+def record(kind, prompt, scenario, response, latency, first_token=None):
+    """
+    Appends one LLM call to the log as a single compact JSON line. `prompt`
+    (the prompt id) stays the lookup key; the full prompt text is stored
+    alongside it so recorded sessions can be audited and diffed.
+    """
+    entry = {"kind": kind, "prompt": prompt, "prompt_text": _prompt_texts.get(prompt),
+             "scenario": scenario, "response": response,
+             "latency": round(latency, 4), "recorded_at": round(time.time(), 3)}
+    if first_token is not None:
+        entry["first_token"] = round(first_token, 4)
+    line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    with _lock:
+        os.makedirs(os.path.dirname(os.path.abspath(LLM_LOG_PATH)), exist_ok=True)
+        with open(LLM_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(line)
+        _stats["recorded"] += 1
+        if _index is not None:
+            _index[_key(kind, prompt, scenario)] = entry
+
+
+def _load_index():
+    global _index
+    with _lock:
+        if _index is None:
+            index = {}
+            if os.path.exists(LLM_LOG_PATH):
+                with open(LLM_LOG_PATH, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue  # torn last line of an interrupted run
+                        # Latest recording of a scenario wins
+                        index[_key(entry["kind"], entry["prompt"], entry["scenario"])] = entry
+            _index = index
+        return _index
+
+
+def lookup(kind, prompt, scenario):
+    entry = _load_index().get(_key(kind, prompt, scenario))
+    with _lock:
+        _stats["replayed" if entry else "replay_misses"] += 1
+    if entry is None:
+        raise LookupError(f"No recorded {kind} response for scenario: {scenario!r}")
+    return entry
+
+
+def _delay(entry):
+    return entry["latency"] if LLM_REPLAY_LATENCY == "recorded" else 0.0
+
+
+# ====================================
+# Wrappers around the live LLM calls
+# ====================================
+def invoke(kind, prompt, scenario, call):
+    """
+    Runs `call()` (returning the raw response text) according to LLM_MODE.
+    """
+    if LLM_MODE == "replay":
+        entry = lookup(kind, prompt, scenario)
+        time.sleep(_delay(entry))
+        return entry["response"]
+
+    start = time.perf_counter()
+    response = call()
+    if LLM_MODE == "record":
+        record(kind, prompt, scenario, response, time.perf_counter() - start)
+    return response
+
+
+async def ainvoke(kind, prompt, scenario, call):
+    # Async counterpart of invoke(); `call` is a coroutine function
+    if LLM_MODE == "replay":
+        entry = lookup(kind, prompt, scenario)
+        await asyncio.sleep(_delay(entry))
+        return entry["response"]
+
+    start = time.perf_counter()
+    response = await call()
+    if LLM_MODE == "record":
+        record(kind, prompt, scenario, response, time.perf_counter() - start)
+    return response
+
+
+async def astream(kind, prompt, scenario, stream):
+    """
+    Streaming counterpart of invoke(); `stream` is an async generator function
+    yielding text chunks. A replayed answer is re-chunked into words paced
+    over the recorded latency. Streams that don't finish are not recorded.
+    """
+    if LLM_MODE == "replay":
+        entry = lookup(kind, prompt, scenario)
+        words = entry["response"].split(" ")
+        delay = _delay(entry)
+        first_token = min(entry.get("first_token", 0.0), delay) if delay else 0.0
+        await asyncio.sleep(first_token)
+        step = (delay - first_token) / max(len(words), 1)
+        for i, word in enumerate(words):
+            yield word if i == 0 else " " + word
+            if step:
+                await asyncio.sleep(step)
+        return
+
+    start = time.perf_counter()
+    first_token = None
+    chunks = []
+    async for chunk in stream():
+        if first_token is None:
+            first_token = time.perf_counter() - start
+        chunks.append(chunk)
+        yield chunk
+    if LLM_MODE == "record":
+        record(kind, prompt, scenario, "".join(chunks), time.perf_counter() - start, first_token)
+
+
+def replay_stats():
+    with _lock:
+        return dict(_stats, mode=LLM_MODE, log_path=LLM_LOG_PATH,
+                    indexed=len(_index) if _index is not None else None)
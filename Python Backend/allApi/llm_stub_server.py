@@ -0,0 +1,175 @@
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmark_predictors import stub_llm_features
+
+# Prose returned to the explanation agents, streamed word by word
+NARRATIVE = (
+    "If this happened, the oceans would absorb most of the change first, shifting currents and "
+    "sea levels, while the atmosphere would redistribute heat and moisture over land. Monsoon "
+    "patterns over India would change, crop yields would follow rainfall and temperature, and "
+    "the economic impact would depend on how quickly agriculture and energy systems adapt."
+)
+
+# Both the Groq (/openai/v1/...) and plain OpenAI (/v1/...) paths are served
+COMPLETION_PATHS = ("/openai/v1/chat/completions", "/v1/chat/completions", "/chat/completions")
+
+
+class StubConfig:
+    """
+    Latency and failure behaviour of the stub, shared by every handler thread.
+    """
+
+    def __init__(self, latency=0.5, jitter=0.1, error_rate=0.0, rate_limit_rate=0.0, tokens_per_second=50.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.tokens_per_second = tokens_per_second
+        self._lock = threading.Lock()
+        self.counts = {"requests": 0, "streams": 0, "errors": 0, "rate_limited": 0}
+
+    def count(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+    def delay(self):
+        return max(self.latency + random.uniform(-self.jitter, self.jitter), 0.0)
+
+
+def completion_text(messages):
+    # The feature-extraction prompt asks for JSON; everything else gets prose
+    prompt = "\n".join(str(message.get("content", "")) for message in messages)
+    if "valid JSON object" in prompt:
+        return json.dumps(stub_llm_features(prompt))
+    return NARRATIVE
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    config = StubConfig()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("/stats", "/openai/v1/models", "/v1/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "stub", "object": "model"}],
+                                  "stats": dict(self.config.counts)})
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        if self.path not in COMPLETION_PATHS:
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        config = self.config
+        config.count("requests")
+
+        time.sleep(config.delay())
+
+        roll = random.random()
+        if roll < config.rate_limit_rate:
+            config.count("rate_limited")
+            self._send_json(429, {"error": {"message": "stub rate limit", "type": "rate_limit_exceeded"}},
+                            headers={"Retry-After": "1"})
+            return
+        if roll < config.rate_limit_rate + config.error_rate:
+            config.count("errors")
+            self._send_json(500, {"error": {"message": "stub server error", "type": "server_error"}})
+            return
+
+        model = request.get("model", "stub")
+        text = completion_text(request.get("messages", []))
+        if request.get("stream"):
+            config.count("streams")
+            self._stream(model, text)
+            return
+
+        self._send_json(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": len(text.split()), "total_tokens": len(text.split())},
+        })
+
+    def _stream(self, model, text):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        interval = 1.0 / self.config.tokens_per_second if self.config.tokens_per_second > 0 else 0.0
+
+        def chunk(delta, finish_reason=None):
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        try:
+            chunk({"role": "assistant", "content": ""})
+            for i, word in enumerate(text.split(" ")):
+                chunk({"content": word if i == 0 else " " + word})
+                time.sleep(interval)
+            chunk({}, finish_reason="stop")
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        self.close_connection = True
+
+
+def serve(host="127.0.0.1", port=8765, **config):
+    StubHandler.config = StubConfig(**config)
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local OpenAI/Groq-compatible chat completions stub.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds before each response")
+    parser.add_argument("--jitter", type=float, default=0.1, help="+/- seconds added to the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction answered with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction answered with HTTP 429")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="streaming speed")
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                   rate_limit_rate=args.rate_limit_rate, tokens_per_second=args.tokens_per_second)
+    print(f"🤖 LLM stub listening on http://{args.host}:{args.port} "
+          f"(set GROQ_BASE_URL=http://{args.host}:{args.port} for allApi)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,191 @@
+"""
+Concurrent load generator for the allApi routes.
+
+Needs httpx on top of the served requirements: pip install -r requirements-bench.txt
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import Counter
+
+import httpx
+
+# ====================================
+# Routes the load generator can drive
+# ====================================
+# name -> (method, path, body builder taking a scenario string)
+ROUTES = {
+    "temperature": ("POST", "/temperature_prediction/", lambda s: {"scenario": s}),
+    "humidity": ("POST", "/humidity_prediction/", lambda s: {"scenario": s}),
+    "croprate": ("POST", "/predict_croprate", lambda s: {"scenario": s}),
+    "economic": ("POST", "/predict_economic_impact", lambda s: {"scenario": s}),
+    "ozone": ("POST", "/ozone_prediction/", lambda s: {"scenario": s}),
+    "adaptation": ("POST", "/predict_adaptation", lambda s: {"scenario": s}),
+    "scenario": ("POST", "/scenario", lambda s: {"scenario": s}),
+    "explain": ("POST", "/explain_whatif/", lambda s: {"scenario": s}),
+    "geopolitics": ("POST", "/geopolitial_impact/", lambda s: {"scenario": s}),
+    "sentiment": ("POST", "/analyze_sentimental_report", lambda s: {"text": s}),
+    "electricity": ("POST", "/predict_electricity", lambda s: {"start_time": "2025-06-01T00:00:00"}),
+    "electricity_forecast": ("POST", "/electricity_forecast", lambda s: {"start_time": "2025-06-01T00:00:00"}),
+    "temperature_graph": ("GET", "/temperature-graph/", None),
+    "temperature_graph_columnar": ("GET", "/temperature-graph/?format=columnar-base64", None),
+    "electricity_columnar": ("POST", "/predict_electricity?format=columnar-base64",
+                             lambda s: {"start_time": "2025-06-01T00:00:00"}),
+}
+
+DEFAULT_MIX = "temperature=3,humidity=2,croprate=2,economic=1,scenario=1"
+
+
+def parse_mix(mix):
+    """
+    "temperature=3,scenario=1" -> {"temperature": 3.0, "scenario": 1.0}
+    """
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in ROUTES:
+            raise ValueError(f"Unknown route '{name}', expected one of: {', '.join(ROUTES)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def make_scenarios(count):
+    # A small pool makes the feature cache and single-flight hit; a large one defeats them
+    return [f"What if the average temperature over India rises by {i / 10:.1f} degrees?" for i in range(count)]
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(seconds for _, _, seconds in samples)
+    ok = sum(1 for _, status, _ in samples if isinstance(status, int) and status < 400)
+    return {
+        "requests": len(samples),
+        "succeeded": ok,
+        "errors": dict(Counter(str(status) for _, status, _ in samples if not (isinstance(status, int) and status < 400))),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "latency_seconds": {
+            "p50": _percentile(latencies, 0.50),
+            "p90": _percentile(latencies, 0.90),
+            "p99": _percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else None,
+        },
+    }
+
+
+async def run_load(base_url, weights, concurrency, duration=None, total_requests=None, scenarios=100,
+                   timeout=120.0, seed=0):
+    """
+    Drives the API with `concurrency` workers, each sending one request at a
+    time, picking routes by weight and scenarios from a fixed pool, until
+    `total_requests` were sent or `duration` seconds elapsed.
+
+    Returns:
+        dict: Overall and per-route throughput, latency percentiles and errors.
+    """
+    rng = random.Random(seed)
+    names, route_weights = zip(*weights.items())
+    pool = make_scenarios(scenarios)
+    sent = itertools.count()
+    samples = []
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def worker(client):
+        while True:
+            if deadline and time.perf_counter() >= deadline:
+                return
+            if total_requests is not None and next(sent) >= total_requests:
+                return
+            name = rng.choices(names, route_weights)[0]
+            method, path, body = ROUTES[name]
+            scenario = rng.choice(pool)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body(scenario) if body else None)
+                status = response.status_code
+            except httpx.TimeoutException:
+                status = "timeout"
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            samples.append((name, status, time.perf_counter() - start))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "base_url": base_url,
+        "concurrency": concurrency,
+        "mix": weights,
+        "scenario_pool": scenarios,
+        "elapsed_seconds": round(elapsed, 3),
+        "overall": summarize(samples, elapsed),
+        "routes": {name: summarize([s for s in samples if s[0] == name], elapsed) for name in names},
+    }
+
+
+def _print_report(report):
+    def line(label, summary):
+        latency = summary["latency_seconds"]
+        ms = lambda v: f"{v * 1000:8.1f}" if v is not None else "       -"
+        print(f"  {label:<18} {summary['requests']:6d} req {summary['throughput_rps']:8.2f} rps | "
+              f"p50 {ms(latency['p50'])} p90 {ms(latency['p90'])} p99 {ms(latency['p99'])} ms | "
+              f"errors {summary['errors'] or 0}")
+
+    print(f"🚦 {report['concurrency']} concurrent clients for {report['elapsed_seconds']}s against {report['base_url']}")
+    for name, summary in report["routes"].items():
+        line(name, summary)
+    line("overall", report["overall"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Concurrent load generator for allApi. Start the API with GROQ_BASE_URL pointing at "
+                    "llm_stub_server.py (or pass --with-stub) to load-test without calling Groq."
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="allApi base URL")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"route=weight list (routes: {', '.join(ROUTES)})")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run (ignored with --requests)")
+    parser.add_argument("--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--scenarios", type=int, default=100, help="distinct scenarios in the pool")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--with-stub", type=int, metavar="PORT",
+                        help="also run llm_stub_server.py on this port (the API must already point at it)")
+    parser.add_argument("--stub-latency", type=float, default=0.5)
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    stub = None
+    if args.with_stub:
+        import threading
+        from llm_stub_server import serve
+        stub = serve(port=args.with_stub, latency=args.stub_latency, error_rate=args.stub_error_rate)
+        threading.Thread(target=stub.serve_forever, daemon=True).start()
+
+    report = asyncio.run(run_load(
+        args.url, parse_mix(args.mix), args.concurrency,
+        duration=None if args.requests else args.duration, total_requests=args.requests,
+        scenarios=args.scenarios, timeout=args.timeout, seed=args.seed,
+    ))
+    if stub is not None:
+        report["llm_stub"] = dict(stub.RequestHandlerClass.config.counts)
+        stub.shutdown()
+
+    _print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report written to {args.output}")
@@ -1,37 +1,75 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
-import nltk
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from fastapi.routing import APIRoute
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.exceptions import RequestValidationError
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from datetime import datetime
+from contextlib import asynccontextmanager
+import asyncio
 import os
-import pandas as pd
-from pyngrok import ngrok  # Add this import
+import threading
+from startup_timing import startup_report, timed_stage
+from metrics import observe_stage, track_request
+from fast_json import FastJSONResponse
+from response_models import (
+    AdaptationResponse, BatchResponse, CropRateResponse, EconomicImpactResponse, ElectricityForecastResponse,
+    HumidityResponse, OzoneResponse, ScenarioResponse, SentimentResponse, StatsResponse, TemperatureResponse,
+    TextResponse,
+)
+
+# "warm" loads every model and dataset before serving; "fast" starts serving
+# immediately and warms them in a background thread
+STARTUP_MODE = os.getenv("STARTUP_MODE", "warm")
 
 # === NLTK Setup ===
+# nltk is only imported (and VADER built) on the first sentiment request
 NLTK_DATA_DIR = os.path.join(os.path.dirname(__file__), 'nltk_data')
-nltk.data.path.append(NLTK_DATA_DIR)
-sid = SentimentIntensityAnalyzer()
+_sid = None
+
+def get_sentiment_analyzer():
+    global _sid
+    if _sid is None:
+        import nltk
+        from nltk.sentiment.vader import SentimentIntensityAnalyzer
+        nltk.data.path.append(NLTK_DATA_DIR)
+        nltk.data.path.append(os.path.dirname(__file__))  # bundled sentiment/vader_lexicon.zip
+        _sid = SentimentIntensityAnalyzer()
+    return _sid
 
 from pydantic import BaseModel
+from typing import List, Literal, Optional
 
 class ScenarioRequest(BaseModel):
     scenario: str
 
+class CompositeScenarioRequest(BaseModel):
+    scenario: str
+    predictors: Optional[List[str]] = None  # defaults to every scenario predictor
+
+class BatchScenarioRequest(BaseModel):
+    scenarios: List[str]
+
 class PredictionRequest(BaseModel):
     start_time: str  # e.g., "2025-05-27T15:00:00"
 
 class InputText(BaseModel):
     text: str
 
+# ?format= on the graph endpoints: the Plotly figure (default) or a compact
+# columnar chart payload (see chart_payload), with JSON lists or base64 arrays
+ChartFormat = Literal["plotly", "columnar", "columnar-base64"]
+
 def get_sentiment(text):
-    scores = sid.polarity_scores(text)
+    scores = get_sentiment_analyzer().polarity_scores(text)
     compound = scores['compound']
     label = 'POSITIVE' if compound >= 0.05 else 'NEGATIVE' if compound <= -0.05 else 'NEUTRAL'
     return label, compound
 
 # === Dataset Analysis (for offline use) ===
 def analyze_dataset(input_csv, output_csv):
+    import pandas as pd
     df = pd.read_csv(input_csv)
     df = df.dropna(subset=['clean_text'])
     results = df['clean_text'].apply(get_sentiment)
@@ -39,7 +77,88 @@ def analyze_dataset(input_csv, output_csv):
     df.to_csv(output_csv, index=False)
     print(f"✅ Sentiment analysis complete. Results saved to: {output_csv}")
 
-app = FastAPI()
+# === Model Registry ===
+# Every booster and the LSTM are loaded once here; the predictors only
+# borrow read-only references from model_registry.get_model().
+def _warm_models():
+    import model_registry
+    model_registry.load_all()
+
+def _warm_datasets():
+    from dataset_mirror import warm_datasets
+    warm_datasets()
+
+def _warm_electricity_forecast():
+    from electricity_store import get_forecast
+    get_forecast()
+
+WARM_UP_STAGES = [
+    ("model_registry", _warm_models),
+    ("datasets", _warm_datasets),
+    ("electricity_forecast", _warm_electricity_forecast),
+]
+
+def warm_up():
+    # A failing stage is reported on GET /startup instead of aborting startup
+    # (warm mode) or killing the warm-up thread (fast mode); requests that need
+    # it load lazily and surface the error themselves
+    for name, stage in WARM_UP_STAGES:
+        try:
+            with timed_stage(name):
+                stage()
+        except Exception as e:
+            startup_report["errors"][name] = str(e)
+            print(f"❌ Warm-up stage '{name}' failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app):
+    from executors import shutdown_executors
+    startup_report["mode"] = STARTUP_MODE
+    if STARTUP_MODE == "fast":
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    else:
+        warm_up()
+    yield
+    shutdown_executors()
+
+# === Request metrics ===
+# Every route records its latency, status and in-flight count (see GET /metrics)
+# and renders through fast_json (orjson, NumPy-aware)
+class TimedJSONResponse(FastJSONResponse):
+    def render(self, content):
+        with observe_stage("serialization"):
+            return super().render(content)
+
+class TimedRoute(APIRoute):
+    def __init__(self, path, endpoint, **kwargs):
+        # FastAPI skips the default response class for routes with a response
+        # model; resolve it so every route is rendered (and timed) the same way
+        response_class = kwargs.get("response_class")
+        if isinstance(response_class, DefaultPlaceholder):
+            kwargs["response_class"] = response_class.value
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        endpoint = self.path  # route template, e.g. /batch_prediction/{predictor}
+
+        async def timed_handler(request):
+            with track_request(endpoint, request.method) as outcome:
+                try:
+                    response = await handler(request)
+                except StarletteHTTPException as e:
+                    outcome["status"] = e.status_code
+                    raise
+                except RequestValidationError:
+                    outcome["status"] = 422
+                    raise
+                outcome["status"] = response.status_code
+                return response
+
+        return timed_handler
+
+app = FastAPI(lifespan=lifespan, default_response_class=TimedJSONResponse)
+app.router.route_class = TimedRoute
 
 app.add_middleware(
     CORSMiddleware,
@@ -49,29 +168,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.post("/predict_adaptation")
-def predict_adaptation(scenario: ScenarioRequest):
+# Scenario predictors go through scenario_runner.predict_one: LLM extraction on
+# the LLM pool, model work on the CPU pool, identical in-flight scenarios coalesced
+@app.post("/predict_adaptation", response_model=AdaptationResponse, response_model_exclude_unset=True)
+async def predict_adaptation(scenario: ScenarioRequest):
+    from scenario_runner import predict_one
     try:
-        from classify import classify_adaptation  
-        result = classify_adaptation(scenario.scenario)
+        result = await predict_one("adaptation", scenario.scenario)
         return {"success": True, "predicted_adaptation_strategy": result}
     except Exception as e:
         return {"success": False, "error": str(e)}
     
-@app.post("/predict_croprate")
-def get_prediction(payload: ScenarioRequest):
+@app.post("/predict_croprate", response_model=CropRateResponse)
+async def get_prediction(payload: ScenarioRequest):
+    from scenario_runner import predict_one
     try:
-        from pretrained_croprate_xgb import predict_croprate
-        result = predict_croprate(payload.scenario)
+        result = await predict_one("crop_yield", payload.scenario)
         return {"success": True, "result": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/predict_economic_impact")
-def predict_economic_impact(request : ScenarioRequest):
-    from pretrained_eco_xgb import predict_eco
+@app.post("/predict_economic_impact", response_model=EconomicImpactResponse)
+async def predict_economic_impact(request : ScenarioRequest):
+    from scenario_runner import predict_one
     try:
-        predicted_value = predict_eco(request.scenario)
+        predicted_value = await predict_one("economic_impact", request.scenario)
         return {
             "message": "Prediction complete.",
             "scenario": request.scenario,
@@ -81,70 +202,206 @@ def predict_economic_impact(request : ScenarioRequest):
         raise HTTPException(status_code=500, detail=str(e))
     
 @app.post("/predict_electricity")
-def predict_electricity(request: PredictionRequest):
-    from pretrained_electricity import electricity_demand_prediction  
+def predict_electricity(request: PredictionRequest, chart_format: ChartFormat = Query("plotly", alias="format")):
     try:
+        # plotly is only imported by the "plotly" format
+        from pretrained_electricity import electricity_demand_chart, electricity_demand_prediction
         start_datetime = datetime.fromisoformat(request.start_time)
-        fig = electricity_demand_prediction(start_datetime)
-        return JSONResponse(content=fig)
+        if chart_format == "plotly":
+            fig = electricity_demand_prediction(start_datetime)
+        else:
+            fig = electricity_demand_chart(start_datetime, "base64" if chart_format == "columnar-base64" else "json")
+        return TimedJSONResponse(content=fig)
     except Exception as e:
         return JSONResponse(content={"error": str(e)}, status_code=500)
 
-@app.post("/explain_whatif/")
-async def explain_whatif_endpoint(scenario: ScenarioRequest):
+@app.post("/electricity_forecast", response_model=ElectricityForecastResponse)
+async def electricity_forecast(request: PredictionRequest):
+    # 24h hourly, 30d daily and 12m monthly demand in one call
+    from executors import cpu_executor
+    try:
+        start_datetime = datetime.fromisoformat(request.start_time)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    try:
+        from electricity_store import electricity_demand_horizons
+        horizons = await cpu_executor.run(electricity_demand_horizons, start_datetime)
+        return {"start_time": request.start_time, **horizons}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/explain_whatif/", response_model=TextResponse)
+async def explain_whatif_endpoint(scenario: ScenarioRequest, request: Request):
+    from async_utils import cancel_on_disconnect, ClientDisconnected
     try:
-        from explaination_agent import explain_planetary_what_if
-        prediction = explain_planetary_what_if(scenario.scenario)
+        from explaination_agent import explain_planetary_what_if_async
+        prediction = await cancel_on_disconnect(request, explain_planetary_what_if_async(scenario.scenario))
         return {"prediction": prediction}
+    except ClientDisconnected:
+        return JSONResponse(content={"error": "Client disconnected"}, status_code=499)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="LLM request timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
-@app.post("/geopolitial_impact/")
-async def get_geopolitial_impact(scenario: ScenarioRequest):
+@app.post("/geopolitial_impact/", response_model=TextResponse)
+async def get_geopolitial_impact(scenario: ScenarioRequest, request: Request):
+    from async_utils import cancel_on_disconnect, ClientDisconnected
     try:
-        from geopolitics_agent import explain_geopolitical_what_if
-        prediction = explain_geopolitical_what_if(scenario.scenario)
+        from geopolitics_agent import explain_geopolitical_what_if_async
+        prediction = await cancel_on_disconnect(request, explain_geopolitical_what_if_async(scenario.scenario))
         return {"prediction": prediction}
+    except ClientDisconnected:
+        return JSONResponse(content={"error": "Client disconnected"}, status_code=499)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="LLM request timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
-@app.post("/ozone_prediction/")
+# Streaming variants: tokens are sent as Server-Sent Events as they arrive
+@app.post("/explain_whatif/stream")
+async def explain_whatif_stream(scenario: ScenarioRequest, request: Request):
+    from async_utils import stream_sse_tokens
+    from explaination_agent import stream_planetary_what_if, LLM_TIMEOUT_SECONDS
+    return StreamingResponse(
+        stream_sse_tokens(request, stream_planetary_what_if(scenario.scenario), LLM_TIMEOUT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/geopolitial_impact/stream")
+async def geopolitial_impact_stream(scenario: ScenarioRequest, request: Request):
+    from async_utils import stream_sse_tokens
+    from geopolitics_agent import stream_geopolitical_what_if, LLM_TIMEOUT_SECONDS
+    return StreamingResponse(
+        stream_sse_tokens(request, stream_geopolitical_what_if(scenario.scenario), LLM_TIMEOUT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/ozone_prediction/", response_model=OzoneResponse)
 async def predict_ozone_endpoint(scenario: ScenarioRequest):
+    from scenario_runner import predict_one
     try:
-        from pretrained_ozone_xgb import predict_ozone
-        prediction = predict_ozone(scenario.scenario)
+        prediction = await predict_one("ozone", scenario.scenario)
         return {"prediction": prediction}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
-@app.post("/humidity_prediction/")
+@app.post("/humidity_prediction/", response_model=HumidityResponse)
 async def predict_humidity(scenario: ScenarioRequest):
+    from scenario_runner import predict_one
     try:
-        from pretrained_humidity_xgb import predict_humidity
-        prediction = predict_humidity(scenario.scenario)
+        prediction = await predict_one("humidity", scenario.scenario)
         return {"prediction": prediction}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
+def etag_matches(request: Request, etag: str) -> bool:
+    # If-None-Match may list several (possibly weak) tags, or be "*"
+    header = request.headers.get("if-none-match", "")
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
 @app.get("/temperature-graph/")
-async def graph_temperature():
+async def graph_temperature(request: Request, chart_format: ChartFormat = Query("plotly", alias="format")):
+    # Computed once per (dataset, LSTM weights) and then served from cache
+    from executors import cpu_executor
     try:
-        from pretrained_temp_lstm import predict_temp_lstm
-        prediction = predict_temp_lstm()
-        return {"prediction": prediction}
+        from pretrained_temp_lstm import cached_temperature_graph
+        etag, body = await cpu_executor.run(cached_temperature_graph, chart_format)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
     
-@app.post("/temperature_prediction/")
+@app.post("/temperature_prediction/", response_model=TemperatureResponse)
 async def predict_temperature(scenario: ScenarioRequest):
+    from scenario_runner import predict_one
     try:
-        from pretrained_temp_xbg import predict_temp
-        prediction = predict_temp(scenario.scenario)
+        prediction = await predict_one("temperature", scenario.scenario)
         return {"prediction": prediction}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
-@app.post("/analyze_sentimental_report")
+@app.get("/metrics")
+def prometheus_metrics():
+    from metrics import render_metrics
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+@app.get("/model_registry", response_model=StatsResponse)
+def model_registry_report():
+    import model_registry
+    return model_registry.registry_report()
+
+@app.get("/model_metrics", response_model=StatsResponse)
+def model_metrics_report():
+    # Test-split metrics persisted by `python model_evaluation.py`, never computed here
+    from model_evaluation import model_metrics
+    return model_metrics()
+
+@app.get("/scenario_cache", response_model=StatsResponse)
+def scenario_cache_stats():
+    from scenario_cache import feature_cache
+    return feature_cache.stats()
+
+@app.get("/startup", response_model=StatsResponse)
+def startup_timing_report():
+    from startup_timing import loaded_allapi_modules
+    return dict(startup_report, loaded_modules=loaded_allapi_modules())
+
+@app.get("/datasets", response_model=StatsResponse)
+def dataset_mirror_stats():
+    from dataset_mirror import mirror_stats
+    return mirror_stats()
+
+@app.get("/llm_replay", response_model=StatsResponse)
+def llm_replay_stats():
+    from llm_replay import replay_stats
+    return replay_stats()
+
+@app.get("/executors", response_model=StatsResponse)
+def executors_stats():
+    from executors import executor_stats
+    return executor_stats()
+
+@app.get("/single_flight", response_model=StatsResponse)
+def single_flight_stats():
+    from scenario_runner import scenario_flights
+    return scenario_flights.stats()
+
+@app.post("/scenario", response_model=ScenarioResponse, response_model_exclude_unset=True)
+async def predict_scenario(request: CompositeScenarioRequest):
+    # One LLM feature extraction fanned out to every scenario predictor in parallel
+    from scenario_runner import FeatureExtractionError, run_scenario
+    try:
+        return await run_scenario(request.scenario, request.predictors)
+    except FeatureExtractionError as e:
+        # Upstream LLM failure, not a client error
+        raise HTTPException(status_code=502, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/batch_prediction/{predictor}", response_model=BatchResponse, response_model_exclude_unset=True)
+async def batch_prediction(predictor: str, request: BatchScenarioRequest):
+    # Many scenarios, one vectorized predict per model (see scenario_runner.run_batch)
+    from scenario_runner import FeatureExtractionError, run_batch
+    try:
+        return await run_batch(predictor, request.scenarios)
+    except FeatureExtractionError as e:
+        # Upstream LLM failure, not a client error
+        raise HTTPException(status_code=502, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/analyze_sentimental_report", response_model=SentimentResponse)
 def analyze_text(data: InputText):
     sentiment, compound = get_sentiment(data.text)
     return {
@@ -0,0 +1,231 @@
+import bisect
+import contextvars
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Stages every request is broken into; see observe_stage()
+STAGES = ("llm_extraction", "dataset_load", "preprocessing", "model_load", "inference", "serialization")
+
+# Seconds; wide enough for a sub-millisecond predict and a minute-long Groq call
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Route template of the request being served, set by main's route class
+current_endpoint = contextvars.ContextVar("current_endpoint", default="")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Thread-safe Prometheus histogram with a fixed label set.
+    """
+
+    def __init__(self, name, documentation, labelnames, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                # per-bucket counts (last one is +Inf), sum, count
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for labelvalues, (counts, total, count) in sorted(series.items()):
+            pairs = list(zip(self.labelnames, labelvalues))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_labels(pairs + [('le', _number(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(pairs)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(pairs)} {count}")
+        return lines
+
+
+class InFlight:
+    """
+    Per-label count of work currently in progress.
+    """
+
+    def __init__(self):
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def add(self, key, delta):
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + delta
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+
+# ====================================
+# Recorded metrics
+# ====================================
+request_seconds = Histogram(
+    "climatopia_request_duration_seconds",
+    "Time spent serving a request, by route template, method and status code.",
+    ["endpoint", "method", "status"],
+)
+stage_seconds = Histogram(
+    "climatopia_stage_duration_seconds",
+    "Time spent in one stage of a request, by stage and model or endpoint.",
+    ["stage", "component"],
+)
+requests_in_flight = InFlight()
+
+
+def observe_stage_seconds(stage, component, seconds):
+    stage_seconds.observe(seconds, stage, component)
+
+
+@contextmanager
+def observe_stage(stage, component=None):
+    """
+    Times the enclosed block as `stage` of `component` (a model name, or the
+    current endpoint when omitted). Work run in a process pool is recorded in
+    the worker and does not show up here.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage_seconds(stage, component or current_endpoint.get(), time.perf_counter() - start)
+
+
+@contextmanager
+def track_request(endpoint, method):
+    """
+    Counts the request as in flight and records its duration and status.
+    The caller sets `status` on the yielded dict.
+    """
+    token = current_endpoint.set(endpoint)
+    requests_in_flight.add((endpoint, method), 1)
+    outcome = {"status": 500}
+    start = time.perf_counter()
+    try:
+        yield outcome
+    finally:
+        request_seconds.observe(time.perf_counter() - start, endpoint, method, str(outcome["status"]))
+        requests_in_flight.add((endpoint, method), -1)
+        current_endpoint.reset(token)
+
+
+# ====================================
+# Gauges and counters read from the existing stats() at scrape time
+# ====================================
+def _family(name, kind, documentation, samples):
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    lines += [f"{name}{_labels(pairs)} {_number(value)}" for pairs, value in samples]
+    return lines
+
+
+def _collect_requests_in_flight():
+    samples = [
+        ([("endpoint", endpoint), ("method", method)], count)
+        for (endpoint, method), count in sorted(requests_in_flight.snapshot().items())
+    ]
+    return _family("climatopia_requests_in_flight", "gauge", "Requests currently being served.", samples)
+
+
+def _collect_feature_cache():
+    from scenario_cache import feature_cache
+    stats = feature_cache.stats()
+    lines = []
+    for key, kind, documentation in (
+        ("hits", "counter", "LLM feature cache hits."),
+        ("misses", "counter", "LLM feature cache misses."),
+        ("evictions", "counter", "LLM feature cache LRU evictions."),
+        ("expirations", "counter", "LLM feature cache TTL expirations."),
+        ("hit_ratio", "gauge", "LLM feature cache hits / lookups since start."),
+        ("size", "gauge", "LLM feature cache entries."),
+    ):
+        name = f"climatopia_scenario_cache_{key}" + ("_total" if kind == "counter" else "")
+        lines += _family(name, kind, documentation, [([], stats[key])])
+    return lines
+
+
+def _collect_executors():
+    from executors import executor_stats
+    stats = executor_stats()
+    lines = []
+    for key, kind, documentation in (
+        ("in_flight", "gauge", "Jobs submitted to the pool and not finished."),
+        ("queue_depth", "gauge", "Jobs waiting for a free worker."),
+        ("completed", "counter", "Jobs finished successfully."),
+        ("failed", "counter", "Jobs that raised."),
+    ):
+        name = f"climatopia_executor_{key}" + ("_total" if kind == "counter" else "")
+        lines += _family(name, kind, documentation, [([("pool", pool)], s[key]) for pool, s in sorted(stats.items())])
+    return lines
+
+
+def _collect_single_flight():
+    # Only once scenario_runner is in use; importing it pulls in the LLM client
+    if "scenario_runner" not in sys.modules:
+        return []
+    stats = sys.modules["scenario_runner"].scenario_flights.stats()
+    endpoints = sorted(stats["endpoints"].items())
+    lines = _family("climatopia_single_flight_in_flight", "gauge",
+                    "Distinct computations currently shared by concurrent requests.", [([], stats["in_flight"])])
+    for key, documentation in (
+        ("executed", "Computations actually run."),
+        ("coalesced", "Requests served by joining an identical in-flight computation."),
+    ):
+        lines += _family(f"climatopia_single_flight_{key}_total", "counter", documentation,
+                         [([("namespace", ns)], s[key]) for ns, s in endpoints])
+    return lines
+
+
+def _collect_datasets():
+    from dataset_mirror import mirror_stats
+    stats = sorted(mirror_stats().items())
+    lines = []
+    for key, documentation in (
+        ("downloads", "Dataset mirror downloads."),
+        ("not_modified", "Dataset mirror revalidations answered 304."),
+        ("failures", "Dataset mirror refresh failures."),
+    ):
+        lines += _family(f"climatopia_dataset_{key}_total", "counter", documentation,
+                         [([("dataset", name)], s[key]) for name, s in stats])
+    return lines
+
+
+def render_metrics():
+    """
+    Every metric in the Prometheus text exposition format (version 0.0.4).
+    """
+    lines = request_seconds.render() + stage_seconds.render()
+    for collect in (_collect_requests_in_flight, _collect_feature_cache, _collect_executors,
+                    _collect_single_flight, _collect_datasets):
+        lines += collect()
+    return "\n".join(lines) + "\n"
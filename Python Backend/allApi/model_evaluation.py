@@ -0,0 +1,260 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from preprocessing import AGRICULTURE_DATASET, DELHI_DATASET, PREPROCESSING_ARTIFACTS
+
+base_path = os.path.dirname(__file__)
+
+# Test-split metrics, computed offline (`python model_evaluation.py`) once per
+# model artifact instead of on every request, and served on GET /model_metrics
+METRICS_PATH = os.getenv("MODEL_METRICS_PATH", os.path.join(base_path, "model_metrics.json"))
+# Chronological 80/20 split, as in the training scripts
+TRAIN_FRACTION = 0.8
+
+# name -> dataset the model is evaluated on
+EVALUATED_MODELS = {
+    "temperature": DELHI_DATASET,
+    "humidity": DELHI_DATASET,
+    "croprate": AGRICULTURE_DATASET,
+    "adaptation": AGRICULTURE_DATASET,
+}
+
+_lock = threading.Lock()
+_file_hashes = {}
+_served = {"signature": None, "metrics": None}
+
+
+def _file_sha256(path):
+    # Re-hashed only when the file's size or mtime changes
+    stat = os.stat(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = _file_hashes.get(path)
+    if cached is None or cached[0] != signature:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        cached = _file_hashes[path] = (signature, digest.hexdigest())
+    return cached[1]
+
+
+def artifact_fingerprint(name):
+    """
+    Hashes of everything the metrics of model `name` depend on: its model
+    files, its preprocessing artifact and its dataset.
+    """
+    from dataset_mirror import dataset_path
+    from model_registry import MODEL_ARTIFACTS
+
+    files = MODEL_ARTIFACTS[name][1] + [PREPROCESSING_ARTIFACTS[name]]
+    missing = [f for f in files if not os.path.exists(os.path.join(base_path, f))]
+    if missing:
+        raise FileNotFoundError(f"Missing model artifact(s): {', '.join(missing)}")
+    return {
+        "files": {f: _file_sha256(os.path.join(base_path, f)) for f in files},
+        "dataset": EVALUATED_MODELS[name],
+        "dataset_sha256": _file_sha256(dataset_path(EVALUATED_MODELS[name])),
+    }
+
+
+# ====================================
+# Evaluators, one per model
+# ====================================
+def _test_split(X, y):
+    split = int(TRAIN_FRACTION * len(X))
+    return X[split:], y[split:]
+
+
+def _regression_metrics(actual, predicted):
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+    return {
+        "test_rows": len(actual),
+        "mae": float(mean_absolute_error(actual, predicted)),
+        "rmse": float(np.sqrt(mean_squared_error(actual, predicted))),
+        "r2": float(r2_score(actual, predicted)),
+        "latest_test_prediction": float(predicted[-1]),
+    }
+
+
+def _load_dataset(name):
+    import pandas as pd
+    from dataset_mirror import dataset_path
+    return pd.read_csv(dataset_path(EVALUATED_MODELS[name]))
+
+
+def _evaluate_window_regressor(name):
+    # XGBoost over flattened 30-day Delhi windows (temperature, humidity)
+    from model_registry import get_model, get_preprocessing
+    from windowing import supervised_windows
+
+    preprocessing = get_preprocessing(name)
+    window_size = preprocessing.artifact["window_size"]
+    column = preprocessing.target_column
+    scaled = preprocessing.transform(_load_dataset(name)[preprocessing.features].values)
+
+    X_test, y_test = _test_split(*supervised_windows(scaled, window_size, column))
+    predicted = get_model(name).predict(X_test)
+    return _regression_metrics(preprocessing.inverse_transform_column(y_test, column),
+                               preprocessing.inverse_transform_column(predicted, column))
+
+
+def _evaluate_croprate(name):
+    from model_registry import get_model, get_preprocessing
+
+    preprocessing = get_preprocessing(name)
+    column = preprocessing.target_column
+    scaled = preprocessing.transform(_load_dataset(name)[preprocessing.features].values)
+
+    X_test, y_test = _test_split(np.delete(scaled, column, axis=1), scaled[:, column])
+    predicted = get_model(name).predict(X_test)
+    return _regression_metrics(preprocessing.inverse_transform_column(y_test, column),
+                               preprocessing.inverse_transform_column(predicted, column))
+
+
+def _evaluate_adaptation(name):
+    from sklearn.metrics import accuracy_score, classification_report
+    from model_registry import get_model, get_preprocessing
+
+    preprocessing = get_preprocessing(name)
+    df = _load_dataset(name)
+    # LabelEncoder classes are sorted, so searchsorted reproduces its encoding
+    encoded = np.searchsorted(preprocessing.classes, df['Adaptation_Strategies'].values)
+
+    X_test, y_test = _test_split(preprocessing.transform(df[preprocessing.features].values), encoded)
+    predicted = np.asarray(get_model(name).predict(X_test)).astype(np.int64)
+    actual_labels = preprocessing.classes[y_test]
+    predicted_labels = preprocessing.classes[predicted]
+    return {
+        "test_rows": len(y_test),
+        "accuracy": float(accuracy_score(actual_labels, predicted_labels)),
+        "classification_report": classification_report(actual_labels, predicted_labels,
+                                                       output_dict=True, zero_division=0),
+        "latest_test_prediction": str(predicted_labels[-1]),
+    }
+
+
+_EVALUATORS = {
+    "temperature": _evaluate_window_regressor,
+    "humidity": _evaluate_window_regressor,
+    "croprate": _evaluate_croprate,
+    "adaptation": _evaluate_adaptation,
+}
+
+
+# ====================================
+# Runner (offline)
+# ====================================
+def _read_metrics(path=METRICS_PATH):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def evaluate(names=None, force=False, path=METRICS_PATH):
+    """
+    Evaluates each model on its test split and persists the metrics. A model
+    whose fingerprint matches its stored entry is skipped unless `force`.
+
+    Args:
+        names (list, optional): Subset of EVALUATED_MODELS.
+        force (bool): Re-evaluate models whose metrics are up to date.
+
+    Returns:
+        dict: Model name -> stored entry.
+    """
+    stored = _read_metrics(path)
+    for name in names or EVALUATED_MODELS:
+        try:
+            fingerprint = artifact_fingerprint(name)
+        except OSError as e:
+            stored[name] = {"evaluated": False, "error": str(e)}
+            print(f"❌ Could not evaluate '{name}': {e}")
+            continue
+
+        entry = stored.get(name, {})
+        if not force and entry.get("evaluated") and entry.get("fingerprint") == fingerprint:
+            print(f"✅ Metrics for '{name}' are up to date")
+            continue
+
+        start = time.perf_counter()
+        try:
+            metrics = _EVALUATORS[name](name)
+        except Exception as e:
+            stored[name] = {"evaluated": False, "error": str(e)}
+            print(f"❌ Could not evaluate '{name}': {e}")
+            continue
+        stored[name] = {
+            "evaluated": True,
+            "fingerprint": fingerprint,
+            "evaluated_at": datetime.now().isoformat(timespec="seconds"),
+            "seconds": round(time.perf_counter() - start, 4),
+            "metrics": metrics,
+        }
+        print(f"✅ Evaluated '{name}' on {metrics['test_rows']} test rows in {stored[name]['seconds']:.3f}s")
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(stored, f, indent=2)
+    os.replace(tmp_path, path)
+    print(f"💾 Metrics written to {path}")
+    return stored
+
+
+# ====================================
+# Served metrics
+# ====================================
+def model_metrics():
+    """
+    The persisted metrics for GET /model_metrics. Each entry is flagged
+    `stale` when the model, preprocessing or dataset changed since it was
+    evaluated; nothing is evaluated on the request path.
+    """
+    try:
+        stat = os.stat(METRICS_PATH)
+        signature = (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        signature = None
+    if _served["signature"] != signature:
+        with _lock:
+            if _served["signature"] != signature:
+                _served.update(signature=signature, metrics=_read_metrics() if signature else {})
+
+    models = {}
+    for name, entry in _served["metrics"].items():
+        entry = dict(entry)
+        if entry.get("evaluated"):
+            try:
+                entry["stale"] = artifact_fingerprint(name) != entry["fingerprint"]
+            except OSError:
+                entry["stale"] = True
+        models[name] = entry
+    return {
+        "path": os.path.basename(METRICS_PATH),
+        "models": models,
+        "not_evaluated": [name for name in EVALUATED_MODELS if not models.get(name, {}).get("evaluated")],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the served models on their test splits.")
+    parser.add_argument("models", nargs="*", help=f"subset of: {', '.join(EVALUATED_MODELS)}")
+    parser.add_argument("--force", action="store_true", help="re-evaluate models whose metrics are up to date")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.models if name not in EVALUATED_MODELS]
+    if unknown:
+        parser.error(f"unknown model(s): {', '.join(unknown)}")
+    evaluate(args.models, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import importlib
+import os
+import threading
+import time
+from types import MappingProxyType
+
+from metrics import observe_stage_seconds
+from preprocessing import PREPROCESSING_ARTIFACTS
+
+base_path = os.path.dirname(__file__)
+
+# "numpy" runs the LSTM with numpy_lstm (no TensorFlow import); "keras" uses Keras
+LSTM_BACKEND = os.getenv("LSTM_BACKEND", "numpy").lower()
+# "compiled" evaluates the boosters with tree_ensemble (flat NumPy arrays,
+# bit-identical to xgboost); "xgboost" loads them with xgboost itself
+TREE_BACKEND = os.getenv("TREE_BACKEND", "compiled").lower()
+
+# ====================================
+# Artifacts served by allApi
+# ====================================
+# name -> (loader kind, artifact files relative to this folder)
+MODEL_ARTIFACTS = {
+    "temperature": ("xgb_regressor", ["xgb_temp_model.json"]),
+    "humidity": ("xgb_regressor", ["xgb_humidity_model.json"]),
+    "croprate": ("xgb_regressor", ["pretrained_croprate_xgb.json"]),
+    "economic": ("xgb_regressor", ["pretrained_eco_xgb.json"]),
+    "ozone": ("xgb_regressor", ["xgb_ozone_model.json"]),
+    "electricity": ("xgb_regressor", ["xgb_electricity_model.json"]),
+    "adaptation": ("xgb_classifier", ["pretrained_adaptation_classifier.json"]),
+    "temperature_lstm": (
+        "keras_lstm" if LSTM_BACKEND == "keras" else "numpy_lstm",
+        ["pretrained_lstm_model.json", "pretrained_lstm.weights.h5"],
+    ),
+}
+# Fitted scalers / last windows / label classes, built by `python preprocessing.py`
+MODEL_ARTIFACTS.update({
+    f"{name}_preprocessing": ("preprocessing", [file]) for name, file in PREPROCESSING_ARTIFACTS.items()
+})
+
+_models = {}
+_load_report = {}
+_lock = threading.Lock()
+
+# Read-only view handed out to the predictors
+models = MappingProxyType(_models)
+
+
+def _load_xgb_regressor(paths):
+    if TREE_BACKEND == "compiled":
+        from tree_ensemble import CompiledRegressor
+        return CompiledRegressor.from_json(paths[0])
+
+    import xgboost as xgb
+    model = xgb.XGBRegressor()
+    model.load_model(paths[0])
+    return model
+
+
+def _load_xgb_classifier(paths):
+    if TREE_BACKEND == "compiled":
+        from tree_ensemble import CompiledClassifier
+        return CompiledClassifier.from_json(paths[0])
+
+    import xgboost as xgb
+    model = xgb.XGBClassifier()
+    model.load_model(paths[0])
+    return model
+
+
+def _load_keras_lstm(paths):
+    from tensorflow.keras.models import model_from_json
+
+    with open(paths[0], 'r') as file:
+        model_json = file.read()
+
+    model = model_from_json(model_json)
+    model.load_weights(paths[1])
+    model.compile(optimizer='adam', loss='mse', metrics=['mae'])
+    return model
+
+
+def _load_numpy_lstm(paths):
+    from numpy_lstm import NumpyLSTMModel
+    return NumpyLSTMModel.from_files(paths[0], paths[1])
+
+
+def _load_preprocessing(paths):
+    from preprocessing import load_preprocessing
+    return load_preprocessing(paths[0])
+
+
+_LOADERS = {
+    "xgb_regressor": _load_xgb_regressor,
+    "xgb_classifier": _load_xgb_classifier,
+    "keras_lstm": _load_keras_lstm,
+    "numpy_lstm": _load_numpy_lstm,
+    "preprocessing": _load_preprocessing,
+}
+
+# Imported before the timed section so the first artifact of each kind
+# doesn't absorb the library import cost in its report
+_LIBRARIES = {
+    "xgb_regressor": "xgboost" if TREE_BACKEND == "xgboost" else "numpy",
+    "xgb_classifier": "xgboost" if TREE_BACKEND == "xgboost" else "numpy",
+    "keras_lstm": "tensorflow",
+    "numpy_lstm": "h5py",
+    "preprocessing": "numpy",
+}
+
+
+def _current_rss_bytes():
+    # Resident set size of this process, 0 when it can't be read
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _load(name):
+    kind, files = MODEL_ARTIFACTS[name]
+    paths = [os.path.join(base_path, f) for f in files]
+
+    try:
+        missing = [f for f, p in zip(files, paths) if not os.path.exists(p)]
+        if missing:
+            raise FileNotFoundError(f"Missing model artifact(s): {', '.join(missing)}")
+        importlib.import_module(_LIBRARIES[kind])
+
+        rss_before = _current_rss_bytes()
+        start = time.perf_counter()
+        model = _LOADERS[kind](paths)
+    except Exception as e:
+        _load_report[name] = {"kind": kind, "files": files, "loaded": False, "error": str(e)}
+        print(f"❌ Could not load model '{name}': {e}")
+        raise
+
+    load_seconds = time.perf_counter() - start
+    observe_stage_seconds("model_load", name, load_seconds)
+    _models[name] = model
+    _load_report[name] = {
+        "kind": kind,
+        "files": files,
+        "loaded": True,
+        "load_seconds": round(load_seconds, 4),
+        "file_bytes": sum(os.path.getsize(p) for p in paths),
+        "rss_delta_bytes": max(_current_rss_bytes() - rss_before, 0),
+    }
+    print(f"✅ Loaded model '{name}' in {load_seconds:.3f}s")
+    return model
+
+
+def load_all(names=None):
+    """
+    Loads every registered artifact into memory. Artifacts that fail to load
+    are recorded in the report instead of aborting startup.
+
+    Args:
+        names (list, optional): Subset of MODEL_ARTIFACTS to load.
+
+    Returns:
+        dict: The per-artifact load report.
+    """
+    with _lock:
+        for name in names or MODEL_ARTIFACTS:
+            if name in _models:
+                continue
+            try:
+                _load(name)
+            except Exception:
+                pass
+    return registry_report()
+
+
+def get_model(name):
+    """
+    Returns the shared in-memory model for `name`, loading it on first use when
+    the registry was not warmed at startup. Callers must treat it as read-only.
+    """
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    with _lock:
+        if name not in _models:
+            _load(name)
+        return _models[name]
+
+
+def reload_model(name):
+    """
+    Loads `name` from disk again, replacing the shared instance, e.g. after
+    its artifact file was updated.
+    """
+    with _lock:
+        return _load(name)
+
+
+def get_preprocessing(name):
+    """
+    Returns the shared preprocessing state (scaler parameters, last window,
+    label classes) stored alongside model `name`.
+    """
+    return get_model(f"{name}_preprocessing")
+
+
+def registry_report():
+    return {name: dict(entry) for name, entry in _load_report.items()}
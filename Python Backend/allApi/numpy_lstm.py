@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+
+# Keras activation name -> float32 NumPy implementation
+def _sigmoid(x):
+    # Same value as 1 / (1 + exp(-x)) without overflowing for large -x
+    return (0.5 * (np.tanh(0.5 * x) + 1.0)).astype(np.float32, copy=False)
+
+
+ACTIVATIONS = {
+    "tanh": np.tanh,
+    "sigmoid": _sigmoid,
+    "relu": lambda x: np.maximum(x, 0.0, dtype=np.float32),
+    "linear": lambda x: x,
+}
+
+
+def _activation(name):
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Unsupported activation: {name}")
+    return ACTIVATIONS[name]
+
+
+class LSTMLayer:
+    """
+    Keras LSTM forward pass. Gates are packed in Keras' i, f, c, o order
+    along the last axis of the kernels and bias.
+    """
+
+    def __init__(self, config, kernel, recurrent_kernel, bias):
+        self.units = config["units"]
+        self.return_sequences = config["return_sequences"]
+        self.activation = _activation(config["activation"])
+        self.recurrent_activation = _activation(config["recurrent_activation"])
+        self.kernel = np.ascontiguousarray(kernel, dtype=np.float32)
+        self.recurrent_kernel = np.ascontiguousarray(recurrent_kernel, dtype=np.float32)
+        self.bias = np.asarray(bias if bias is not None else np.zeros(4 * self.units), dtype=np.float32)
+
+    def __call__(self, x):
+        batch, steps, _ = x.shape
+        units = self.units
+        # Input projection for every timestep in one matmul; only the
+        # recurrent part has to run step by step
+        projected = (x.reshape(batch * steps, -1) @ self.kernel + self.bias).reshape(batch, steps, 4 * units)
+
+        h = np.zeros((batch, units), dtype=np.float32)
+        c = np.zeros((batch, units), dtype=np.float32)
+        outputs = np.empty((batch, steps, units), dtype=np.float32) if self.return_sequences else None
+        for t in range(steps):
+            z = projected[:, t] + h @ self.recurrent_kernel
+            i = self.recurrent_activation(z[:, :units])
+            f = self.recurrent_activation(z[:, units:2 * units])
+            g = self.activation(z[:, 2 * units:3 * units])
+            o = self.recurrent_activation(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * self.activation(c)
+            if outputs is not None:
+                outputs[:, t] = h
+        return outputs if outputs is not None else h
+
+
+class DenseLayer:
+    def __init__(self, config, kernel, bias):
+        self.activation = _activation(config["activation"])
+        self.kernel = np.ascontiguousarray(kernel, dtype=np.float32)
+        self.bias = np.asarray(bias if bias is not None else np.zeros(config["units"]), dtype=np.float32)
+
+    def __call__(self, x):
+        return self.activation(x @ self.kernel + self.bias)
+
+
+class NumpyLSTMModel:
+    """
+    Inference-only stand-in for the Keras Sequential LSTM model: reads the
+    architecture JSON and the .weights.h5 file Keras saved and runs the
+    forward pass in float32 NumPy, without importing TensorFlow.
+    """
+
+    def __init__(self, layers, input_shape):
+        self.layers = layers
+        self.input_shape = tuple(input_shape)
+
+    @classmethod
+    def from_files(cls, architecture_path, weights_path):
+        import h5py
+
+        with open(architecture_path, 'r') as f:
+            architecture = json.load(f)
+
+        layers, input_shape = [], None
+        with h5py.File(weights_path, 'r') as weights:
+            for layer in architecture["config"]["layers"]:
+                kind, config = layer["class_name"], layer["config"]
+                if kind == "InputLayer":
+                    input_shape = config["batch_shape"][1:]
+                    continue
+                if kind == "Dropout":
+                    continue  # identity at inference time
+
+                # Keras 3 layout: layers/<name>[/cell]/vars/<index>
+                group = weights["layers"][config["name"]]
+                variables = group["cell"]["vars"] if "cell" in group else group["vars"]
+                values = [variables[str(i)][()] for i in range(len(variables))]
+                bias = values[-1] if config.get("use_bias", True) else None
+                if kind == "LSTM":
+                    layers.append(LSTMLayer(config, values[0], values[1], bias))
+                elif kind == "Dense":
+                    layers.append(DenseLayer(config, values[0], bias))
+                else:
+                    raise ValueError(f"Unsupported layer: {kind}")
+
+        return cls(layers, input_shape)
+
+    def predict(self, x, batch_size=256, verbose=0):
+        """
+        Same contract as keras Model.predict: (windows, steps, features) in,
+        (windows, outputs) float32 out. Windows are processed in batches of
+        `batch_size` to bound the size of the intermediate activations.
+        """
+        x = np.asarray(x, dtype=np.float32)
+        if x.ndim != 3 or (self.input_shape and tuple(x.shape[1:]) != self.input_shape):
+            raise ValueError(f"Expected input of shape (n, {', '.join(map(str, self.input_shape))}), got {x.shape}")
+
+        outputs = []
+        for start in range(0, len(x), batch_size):
+            batch = x[start:start + batch_size]
+            for layer in self.layers:
+                batch = layer(batch)
+            outputs.append(batch)
+        if not outputs:
+            return np.empty((0, 1), dtype=np.float32)
+        return np.concatenate(outputs)
+
+
+# ====================================
+# Parity with Keras
+# ====================================
+# Keras outputs for a fixed sample of Delhi windows, recorded once with
+# TensorFlow installed (`python numpy_lstm.py --record`), so the NumPy forward
+# pass can be checked offline without it (`python numpy_lstm.py`)
+REFERENCE_FILE = "pretrained_lstm_reference.npz"
+REFERENCE_WINDOWS = 64
+# float32 forward passes that accumulate in a different order
+PARITY_TOLERANCE = 1e-5
+
+
+def _model_paths():
+    base_path = os.path.dirname(__file__)
+    return (os.path.join(base_path, "pretrained_lstm_model.json"),
+            os.path.join(base_path, "pretrained_lstm.weights.h5"))
+
+
+def _sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _delhi_windows():
+    import pandas as pd
+    from sklearn.preprocessing import MinMaxScaler
+    from windowing import lstm_windows
+
+    df = pd.read_csv(os.path.join(os.path.dirname(__file__), "Datasets", "DailyDelhiClimateTrain.csv"))
+    data = MinMaxScaler().fit_transform(df[['meantemp', 'humidity', 'wind_speed', 'meanpressure']].values)
+    return data, lstm_windows(data.astype(np.float32), 60)[:len(data) - 60]
+
+
+def record_reference(path):
+    """
+    Runs the Keras model (TensorFlow required) on an evenly spaced sample of
+    the Delhi windows and stores inputs and outputs with the weights' hash.
+    """
+    from model_registry import _load_keras_lstm
+
+    architecture_path, weights_path = _model_paths()
+    _, windows = _delhi_windows()
+    sample = np.ascontiguousarray(windows[np.linspace(0, len(windows) - 1, REFERENCE_WINDOWS).astype(int)])
+    expected = _load_keras_lstm([architecture_path, weights_path]).predict(sample, verbose=0)
+    np.savez_compressed(path, windows=sample, expected=expected.astype(np.float32),
+                        weights_sha256=_sha256(weights_path), architecture_sha256=_sha256(architecture_path))
+    print(f"💾 Recorded Keras outputs for {len(sample)} windows to {path}")
+
+
+def check_parity(path):
+    """
+    Compares the NumPy forward pass with the recorded Keras outputs.
+
+    Returns:
+        float: Max absolute difference, or None if the reference is for
+            other model files.
+    """
+    architecture_path, weights_path = _model_paths()
+    reference = np.load(path)
+    if (str(reference["weights_sha256"]) != _sha256(weights_path)
+            or str(reference["architecture_sha256"]) != _sha256(architecture_path)):
+        print(f"⚠️ {os.path.basename(path)} was recorded for other model files; re-record it with --record")
+        return None
+    predictions = NumpyLSTMModel.from_files(architecture_path, weights_path).predict(reference["windows"])
+    return float(np.abs(predictions - reference["expected"]).max())
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description="Check the NumPy LSTM against Keras.")
+    parser.add_argument("--record", action="store_true",
+                        help=f"record {REFERENCE_FILE} from the Keras model (needs TensorFlow)")
+    args = parser.parse_args()
+
+    reference_path = os.path.join(os.path.dirname(__file__), REFERENCE_FILE)
+    if args.record:
+        record_reference(reference_path)
+
+    difference = check_parity(reference_path)
+    if difference is None:
+        sys.exit(1)
+    print(f"{'✅' if difference <= PARITY_TOLERANCE else '❌'} Max abs difference vs recorded Keras outputs: "
+          f"{difference:.2e} (tolerance {PARITY_TOLERANCE:.0e})")
+
+    data, windows = _delhi_windows()
+    start = time.perf_counter()
+    predictions = NumpyLSTMModel.from_files(*_model_paths()).predict(windows)
+    print(f"⚡ NumPy LSTM: {len(windows)} windows in {time.perf_counter() - start:.3f}s")
+    print(f"📉 Scaled MAE vs actual next-day meantemp: {np.abs(predictions[:, 0] - data[60:, 0]).mean():.4f}")
+    sys.exit(0 if difference <= PARITY_TOLERANCE else 1)
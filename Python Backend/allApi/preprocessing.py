@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+base_path = os.path.dirname(__file__)
+
+DELHI_FEATURES = ['meantemp', 'humidity', 'wind_speed', 'meanpressure']
+AGRICULTURE_FEATURES = [
+    'Average_Temperature_C', 'Total_Precipitation_mm', 'CO2_Emissions_MT',
+    'Crop_Yield_MT_per_HA', 'Pesticide_Use_KG_per_HA', 'Fertilizer_Use_KG_per_HA',
+    'Soil_Health_Index', 'Economic_Impact_Million_USD'
+]
+ADAPTATION_FEATURES = [
+    'Average_Temperature_C', 'Total_Precipitation_mm', 'CO2_Emissions_MT',
+    'Crop_Yield_MT_per_HA', 'Pesticide_Use_KG_per_HA',
+    'Fertilizer_Use_KG_per_HA', 'Soil_Health_Index'
+]
+
+# dataset_mirror names; the mirror falls back to the bundled Datasets/ copies
+DELHI_DATASET = 'DailyDelhiClimateTrain'
+AGRICULTURE_DATASET = 'climate_change_impact_on_agriculture_2024'
+
+# ====================================
+# Preprocessing artifacts, one per model
+# ====================================
+# name -> artifact file stored next to the model
+PREPROCESSING_ARTIFACTS = {
+    "temperature": "xgb_temp_preprocessing.json",
+    "humidity": "xgb_humidity_preprocessing.json",
+    "croprate": "pretrained_croprate_preprocessing.json",
+    "economic": "pretrained_eco_preprocessing.json",
+    "adaptation": "pretrained_adaptation_preprocessing.json",
+}
+
+
+class PreprocessingState:
+    """
+    Fitted MinMaxScaler parameters (and whatever else a predictor needs from
+    its training data) restored from a preprocessing artifact. Arrays are
+    read-only so the state can be shared between requests.
+    """
+
+    def __init__(self, artifact):
+        self.artifact = artifact
+        self.features = artifact["features"]
+        self.target_column = artifact.get("target_column")
+        self.scale = _readonly(artifact["scaler"]["scale"])
+        self.min = _readonly(artifact["scaler"]["min"])
+        self.last_window = _readonly(artifact["last_window"]) if "last_window" in artifact else None
+        self.classes = _readonly(artifact["classes"]) if "classes" in artifact else None
+
+    def transform(self, values):
+        # Same arithmetic as MinMaxScaler.transform
+        values = np.asarray(values, dtype=np.float64)
+        return values * self.scale + self.min
+
+    def inverse_transform_column(self, values, column):
+        # Same arithmetic as MinMaxScaler.inverse_transform for a single column
+        values = np.asarray(values, dtype=np.float64)
+        return (values - self.min[column]) / self.scale[column]
+
+
+def _readonly(values):
+    array = np.asarray(values)
+    array.flags.writeable = False
+    return array
+
+
+def load_preprocessing(path):
+    with open(path, 'r') as file:
+        return PreprocessingState(json.load(file))
+
+
+# ====================================
+# Artifact builder (offline)
+# ====================================
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _scaler_params(scaler):
+    return {
+        "scale": scaler.scale_.tolist(),
+        "min": scaler.min_.tolist(),
+        "data_min": scaler.data_min_.tolist(),
+        "data_max": scaler.data_max_.tolist(),
+    }
+
+
+def _build_delhi(target_column, window_size=30):
+    import pandas as pd
+    from dataset_mirror import dataset_path
+    from sklearn.preprocessing import MinMaxScaler
+    from windowing import last_window
+
+    source_path = dataset_path(DELHI_DATASET)
+    df = pd.read_csv(source_path)
+    scaler = MinMaxScaler()
+    scaled_data = scaler.fit_transform(df[DELHI_FEATURES].values)
+
+    return {
+        "source": DELHI_DATASET,
+        "source_sha256": _sha256(source_path),
+        "features": DELHI_FEATURES,
+        "target_column": target_column,
+        "window_size": window_size,
+        "scaler": _scaler_params(scaler),
+        # The scenario row is appended to these to form the model input window
+        "last_window": last_window(scaled_data, window_size - 1)[0].tolist(),
+    }
+
+
+def _build_croprate():
+    import pandas as pd
+    from dataset_mirror import dataset_path
+    import xgboost as xgb
+    from sklearn.preprocessing import MinMaxScaler
+
+    source_path = dataset_path(AGRICULTURE_DATASET)
+    df = pd.read_csv(source_path)
+    scaler = MinMaxScaler()
+    scaled_data = scaler.fit_transform(df[AGRICULTURE_FEATURES].values)
+    target_column = AGRICULTURE_FEATURES.index('Crop_Yield_MT_per_HA')
+
+    # Prediction for the last row of the test split, reported with every scenario
+    model = xgb.XGBRegressor()
+    model.load_model(os.path.join(base_path, 'pretrained_croprate_xgb.json'))
+    X_last = np.delete(scaled_data[-1:], target_column, axis=1)
+    latest_scaled = float(model.predict(X_last)[0])
+
+    return {
+        "source": AGRICULTURE_DATASET,
+        "source_sha256": _sha256(source_path),
+        "features": AGRICULTURE_FEATURES,
+        "target_column": target_column,
+        "scaler": _scaler_params(scaler),
+        "latest_test_prediction": float(
+            (latest_scaled - scaler.min_[target_column]) / scaler.scale_[target_column]
+        ),
+    }
+
+
+def _build_economic():
+    import pandas as pd
+    from dataset_mirror import dataset_path
+    from sklearn.preprocessing import MinMaxScaler
+
+    source_path = dataset_path(AGRICULTURE_DATASET)
+    df = pd.read_csv(source_path)
+    scaler = MinMaxScaler()
+    scaler.fit(df[AGRICULTURE_FEATURES].values)
+
+    return {
+        "source": AGRICULTURE_DATASET,
+        "source_sha256": _sha256(source_path),
+        "features": AGRICULTURE_FEATURES,
+        "target_column": AGRICULTURE_FEATURES.index('Economic_Impact_Million_USD'),
+        "scaler": _scaler_params(scaler),
+    }
+
+
+def _build_adaptation():
+    import pandas as pd
+    from dataset_mirror import dataset_path
+    from sklearn.preprocessing import MinMaxScaler, LabelEncoder
+
+    source_path = dataset_path(AGRICULTURE_DATASET)
+    df = pd.read_csv(source_path)
+    label_encoder = LabelEncoder()
+    label_encoder.fit(df['Adaptation_Strategies'])
+    scaler = MinMaxScaler()
+    scaler.fit(df[ADAPTATION_FEATURES].values)
+
+    return {
+        "source": AGRICULTURE_DATASET,
+        "source_sha256": _sha256(source_path),
+        "features": ADAPTATION_FEATURES,
+        "scaler": _scaler_params(scaler),
+        "classes": label_encoder.classes_.tolist(),
+    }
+
+
+_BUILDERS = {
+    "temperature": lambda: _build_delhi(target_column=0),
+    "humidity": lambda: _build_delhi(target_column=1),
+    "croprate": _build_croprate,
+    "economic": _build_economic,
+    "adaptation": _build_adaptation,
+}
+
+
+def build_artifacts(names=None):
+    for name in names or PREPROCESSING_ARTIFACTS:
+        artifact = _BUILDERS[name]()
+        path = os.path.join(base_path, PREPROCESSING_ARTIFACTS[name])
+        with open(path, 'w') as file:
+            json.dump(artifact, file)
+        print(f"✅ Wrote {PREPROCESSING_ARTIFACTS[name]}")
+
+
+if __name__ == "__main__":
+    build_artifacts()
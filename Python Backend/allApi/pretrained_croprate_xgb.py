@@ -1,50 +1,14 @@
 # predictor.py
 
-import xgboost as xgb
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
-import pandas as pd
-import os
 from LLM import run_climate_scenario_prediction
+from batching import batch_predict
+from metrics import observe_stage
+from model_registry import get_model, get_preprocessing
 
-def predict_croprate(scenario: str) -> dict:
-    llm_prediction = run_climate_scenario_prediction(scenario)
-
-    base_path = os.path.dirname(__file__)
-    file_path = os.path.join(base_path, 'Datasets', 'climate_change_impact_on_agriculture_2024.csv')
-    model_path = os.path.join(base_path, 'pretrained_croprate_xgb.json')
-
-    df = pd.read_csv(file_path)
-
-    all_features = ['Average_Temperature_C', 'Total_Precipitation_mm', 'CO2_Emissions_MT',
-                    'Crop_Yield_MT_per_HA', 'Pesticide_Use_KG_per_HA', 'Fertilizer_Use_KG_per_HA',
-                    'Soil_Health_Index', 'Economic_Impact_Million_USD']
-    numeric_features = [f for f in all_features if f != 'Country']
-    data = df[numeric_features].values
-
-    scaler = MinMaxScaler()
-    scaled_data = scaler.fit_transform(data)
-
-    target_column = numeric_features.index('Crop_Yield_MT_per_HA')
-    X = scaled_data[:, [i for i in range(len(numeric_features)) if i != target_column]]
-    y = scaled_data[:, target_column]
-
-    split = int(0.8 * len(X))
-    X_test, y_test = X[split:], y[split:]
-
-    loaded_model = xgb.XGBRegressor()
-    loaded_model.load_model(model_path)
-
-    y_pred_scaled = loaded_model.predict(X_test)
-
-    y_pred_full = np.zeros((len(y_pred_scaled), scaled_data.shape[1]))
-    y_pred_full[:, target_column] = y_pred_scaled
-
-    y_test_full = np.zeros((len(y_test), scaled_data.shape[1]))
-    y_test_full[:, target_column] = y_test
-
-    y_pred_rescaled = scaler.inverse_transform(y_pred_full)[:, target_column]
-    y_test_rescaled = scaler.inverse_transform(y_test_full)[:, target_column]
+def croprate_input_row(llm_prediction, preprocessing):
+    numeric_features = preprocessing.features
+    target_column = preprocessing.target_column
 
     llm_input_features = np.array([
         llm_prediction['meantemp'],
@@ -65,16 +29,42 @@ def predict_croprate(scenario: str) -> dict:
             llm_scaled_full[0, i] = llm_input_features[0, llm_input_index]
             llm_input_index += 1
 
-    llm_input_scaled = llm_scaled_full[:, [i for i in range(len(numeric_features)) if i != target_column]]
-
-    llm_pred_scaled = loaded_model.predict(llm_input_scaled)
-
-    llm_pred_full = np.zeros((1, scaled_data.shape[1]))
-    llm_pred_full[0, target_column] = llm_pred_scaled
-    llm_pred_rescaled = scaler.inverse_transform(llm_pred_full)[0, target_column]
+    return llm_scaled_full[:, [i for i in range(len(numeric_features)) if i != target_column]]
 
+def format_croprate(llm_prediction, llm_pred_rescaled, preprocessing):
     return {
-        "latest_test_crop_yield": round(float(y_pred_rescaled[-1]), 2),
+        "latest_test_crop_yield": round(preprocessing.artifact["latest_test_prediction"], 2),
         "llm_predicted_crop_yield": round(float(llm_pred_rescaled), 2),
         "llm_input": llm_prediction
     }
+
+def predict_croprate(scenario: str, features: dict = None) -> dict:
+    # `features` lets a caller that already ran the LLM extraction skip it
+    llm_prediction = features if features is not None else run_climate_scenario_prediction(scenario)
+
+    # Fitted scaler and test-split prediction (built by preprocessing.py)
+    preprocessing = get_preprocessing("croprate")
+    target_column = preprocessing.target_column
+
+    loaded_model = get_model("croprate")
+
+    with observe_stage("preprocessing", "croprate"):
+        llm_input_scaled = croprate_input_row(llm_prediction, preprocessing)
+
+    with observe_stage("inference", "croprate"):
+        llm_pred_scaled = loaded_model.predict(llm_input_scaled)
+
+    llm_pred_rescaled = preprocessing.inverse_transform_column(llm_pred_scaled, target_column)[0]
+
+    return format_croprate(llm_prediction, llm_pred_rescaled, preprocessing)
+
+def predict_croprate_batch(scenarios, features_list):
+    # One predict() over every scenario row instead of one per scenario
+    preprocessing = get_preprocessing("croprate")
+    loaded_model = get_model("croprate")
+
+    def predict_rows(X, indices):
+        rescaled = preprocessing.inverse_transform_column(loaded_model.predict(X), preprocessing.target_column)
+        return [format_croprate(features_list[i], value, preprocessing) for i, value in zip(indices, rescaled)]
+
+    return batch_predict(features_list, lambda f: croprate_input_row(f, preprocessing), predict_rows, component="croprate")
@@ -1,41 +1,21 @@
-import os
 import numpy as np
-import pandas as pd
-import xgboost as xgb
-from sklearn.preprocessing import MinMaxScaler
 from LLM import run_climate_scenario_prediction
+from batching import batch_predict
+from metrics import observe_stage
+from model_registry import get_model, get_preprocessing
 
 
 def load_model_and_data():
-    base_path = os.path.dirname(__file__)
-    file_path = os.path.join(base_path, 'Datasets', 'climate_change_impact_on_agriculture_2024.csv')
-    model_path = os.path.join(base_path, 'pretrained_eco_xgb.json')
+    # Fitted scaler state (built by preprocessing.py) instead of re-reading the dataset
+    preprocessing = get_preprocessing("economic")
+    model = get_model("economic")
 
-    df = pd.read_csv(file_path)
+    return model, preprocessing, preprocessing.target_column, preprocessing.features
 
-    all_features = [
-        'Average_Temperature_C', 'Total_Precipitation_mm', 'CO2_Emissions_MT',
-        'Crop_Yield_MT_per_HA', 'Pesticide_Use_KG_per_HA', 'Fertilizer_Use_KG_per_HA',
-        'Soil_Health_Index', 'Economic_Impact_Million_USD'
-    ]
-    numeric_features = all_features
-    data = df[numeric_features].values
 
-    scaler = MinMaxScaler()
-    scaled_data = scaler.fit_transform(data)
-
-    target_column = numeric_features.index('Economic_Impact_Million_USD')
-    model = xgb.XGBRegressor()
-    model.load_model(model_path)
-
-    return model, scaler, scaled_data, target_column, numeric_features
-
-
-def predict_eco(scenario: str) -> float:
-    model, scaler, scaled_data, target_column, numeric_features = load_model_and_data()
-
-    # Get features from LLM
-    prediction = run_climate_scenario_prediction(scenario)
+def eco_input_row(prediction, preprocessing):
+    target_column = preprocessing.target_column
+    numeric_features = preprocessing.features
 
     # Format the features
     llm_input_features = np.array([
@@ -50,14 +30,34 @@ def predict_eco(scenario: str) -> float:
 
     # Append a zero column for the target to match scaler input
     padded_input = np.hstack([llm_input_features, np.zeros((1, 1))])
-    scaled_input = scaler.transform(padded_input)
+    scaled_input = preprocessing.transform(padded_input)
+
+    return scaled_input[:, [i for i in range(len(numeric_features)) if i != target_column]]
+
 
-    X_input = scaled_input[:, [i for i in range(len(numeric_features)) if i != target_column]]
-    pred_scaled = model.predict(X_input)
+def predict_eco(scenario: str, features: dict = None) -> float:
+    model, preprocessing, target_column, numeric_features = load_model_and_data()
+
+    # Get features from LLM (unless the caller already extracted them)
+    prediction = features if features is not None else run_climate_scenario_prediction(scenario)
+
+    with observe_stage("preprocessing", "economic"):
+        X_input = eco_input_row(prediction, preprocessing)
+    with observe_stage("inference", "economic"):
+        pred_scaled = model.predict(X_input)
 
     # Inverse scale the prediction
-    full_output = np.zeros((1, scaled_data.shape[1]))
-    full_output[:, target_column] = pred_scaled
-    pred_rescaled = scaler.inverse_transform(full_output)[0, target_column]
+    pred_rescaled = preprocessing.inverse_transform_column(pred_scaled, target_column)[0]
 
     return round(pred_rescaled, 2)
+
+
+def predict_eco_batch(scenarios, features_list):
+    # One predict() over every scenario row instead of one per scenario
+    model, preprocessing, target_column, numeric_features = load_model_and_data()
+
+    def predict_rows(X, indices):
+        rescaled = preprocessing.inverse_transform_column(model.predict(X), target_column)
+        return [round(value, 2) for value in rescaled]
+
+    return batch_predict(features_list, lambda f: eco_input_row(f, preprocessing), predict_rows, component="economic")
@@ -1,64 +1,57 @@
-import os
-import pandas as pd
 from datetime import datetime, timedelta
-import plotly.graph_objs as go
-import xgboost as xgb
+from electricity_store import electricity_demand_horizons, get_forecast
+from metrics import observe_stage
+from chart_payload import chart_payload
 
 
-def load_xgboost_model(model_path):
+def load_forecast():
     try:
-        model = xgb.XGBRegressor()
-        model.load_model(model_path)
-        return model
+        return get_forecast()
     except Exception as e:
         print(f"Error loading model: {e}")
         return None
 
 
-def electricity_demand_prediction(start_datetime):
-    dataset_path = os.path.join(os.path.dirname(__file__), 'Datasets', '2025 testset.csv')
-    model_path = os.path.join(os.path.dirname(__file__), 'xgb_electricity_model.json')
-
-    # Load dataset
-    df = pd.read_csv(dataset_path, parse_dates=['timestamp'])
-
-    # Define 24h range
-    end_datetime = start_datetime + timedelta(hours=24)
+def demand_window(start_datetime, end_datetime):
+    # The whole year is predicted once (see electricity_store); a request slices it
+    with observe_stage("dataset_load", "electricity"):
+        forecast = load_forecast()
+    if forecast is None:
+        print("Model could not be loaded.")
+        return
 
-    # Filter and copy to avoid SettingWithCopyWarning
-    df_24h = df[(df['timestamp'] >= start_datetime) & (df['timestamp'] < end_datetime)].copy()
+    window = forecast.window(start_datetime, end_datetime)
 
-    if df_24h.empty:
+    if len(window['timestamp']) == 0:
         print("No data available for the next 24 hours from the given start datetime.")
         return
+    return window
 
-    # Load model
-    model = load_xgboost_model(model_path)
-    if model is None:
-        print("Model could not be loaded.")
-        return
-
-    # Feature engineering matching model's training features
-    df_24h['day_of_week'] = df_24h['timestamp'].dt.dayofweek
-    df_24h['hour_of_day'] = df_24h['timestamp'].dt.hour
-    df_24h['is_weekend'] = (df_24h['day_of_week'] >= 5).astype(int)
 
-    features = ['day_of_week', 'hour_of_day', 'is_weekend', 'temperature', 'is_holiday', 'solar_generation']
+def electricity_demand_prediction(start_datetime):
+    # The Plotly figure path; the columnar chart and horizons need neither
+    import pandas as pd
+    import plotly.graph_objs as go
 
-    X_test = df_24h[features]
+    # Define 24h range
+    end_datetime = start_datetime + timedelta(hours=24)
+    window = demand_window(start_datetime, end_datetime)
+    if window is None:
+        return
 
-    # Predict
-    df_24h['predicted_demand'] = model.predict(X_test)
+    timestamps = pd.to_datetime(window['timestamp'])
+    predicted_demand = window['predicted_demand']
 
     # Identify peak and lowest demand points
-    peak_point = df_24h.loc[df_24h['predicted_demand'].idxmax()]
-    lowest_point = df_24h.loc[df_24h['predicted_demand'].idxmin()]
+    peak, lowest = window['peak'], window['lowest']
+    peak_point = {'timestamp': timestamps[peak], 'predicted_demand': predicted_demand[peak]}
+    lowest_point = {'timestamp': timestamps[lowest], 'predicted_demand': predicted_demand[lowest]}
 
     # Plotting with Plotly
     fig = go.Figure()
 
     fig.add_trace(go.Scatter(
-        x=df_24h['timestamp'], y=df_24h['predicted_demand'],
+        x=timestamps, y=predicted_demand,
         mode='lines+markers', name='Predicted Electricity Demand',
         line=dict(color='blue'), marker=dict(size=4)
     ))
@@ -93,11 +86,37 @@ def electricity_demand_prediction(start_datetime):
 
 
     # Return the JSON string of the figure
-    return fig.to_json()
+    with observe_stage("serialization", "electricity"):
+        return fig.to_json()
+
+
+def electricity_demand_chart(start_datetime, encoding="json"):
+    # Same graph as electricity_demand_prediction as a columnar payload (see chart_payload)
+    end_datetime = start_datetime + timedelta(hours=24)
+    window = demand_window(start_datetime, end_datetime)
+    if window is None:
+        return
+
+    series = 'Predicted Electricity Demand'
+    predicted_demand = window['predicted_demand']
+    peak, lowest = window['peak'], window['lowest']
+    with observe_stage("serialization", "electricity"):
+        return chart_payload(
+            window['timestamp'],
+            [(series, predicted_demand, {"mode": "lines+markers", "color": "blue"})],
+            title=f"⚡ Predicted Electricity Demand from {start_datetime} to {end_datetime}",
+            x_title="Time",
+            y_title="Electricity Demand (units)",
+            annotations=[
+                {"series": series, "index": peak, "text": f"Peak: {predicted_demand[peak]:.2f}"},
+                {"series": series, "index": lowest, "text": f"Lowest: {predicted_demand[lowest]:.2f}"},
+            ],
+            encoding=encoding,
+        )
 
-    
 
 # Example usage:
 if __name__ == "__main__":
     now = datetime.now()
     electricity_demand_prediction(now)
+    print({name: len(h["timestamp"]) for name, h in electricity_demand_horizons(datetime(2025, 6, 1)).items()})
@@ -1,45 +1,61 @@
-import xgboost as xgb
 import numpy as np
-import pandas as pd
 from datetime import datetime
-import os
 from LLM import run_climate_scenario_prediction
+from batching import batch_predict
+from metrics import observe_stage
+from model_registry import get_model
 
+input_features = ["Month", "Day_of_month", "Day_of_week", "pressure_height", "Temperature_Sandburg", 
+                  "Temperature_ElMonte", "Inversion_base_height", "Pressure_gradient", "Inversion_temperature", "Visibility", "Wind_speed", "Humidity"]
 
-def predict_ozone(scenario):
-    # ====================================
-    # Use LLM to map scenario to input features
-    # ====================================
-    feature_dict = run_climate_scenario_prediction(scenario)
 
+def ozone_input_row(features, now=None):
     # ====================================
     # Add Date-based Features
+    # (on a copy, the LLM features may be shared)
     # ====================================
-    now = datetime.now()
+    feature_dict = dict(features)
+    now = now or datetime.now()
     feature_dict["Month"] = now.month
     feature_dict["Day_of_month"] = now.day
     feature_dict["Day_of_week"] = now.weekday()  # Monday = 0
 
-    input_features = ["Month", "Day_of_month", "Day_of_week", "pressure_height", "Temperature_Sandburg", 
-                      "Temperature_ElMonte", "Inversion_base_height", "Pressure_gradient", "Inversion_temperature", "Visibility", "Wind_speed", "Humidity"]
-    X_input = np.array([feature_dict[feat] for feat in input_features]).reshape(1, -1)
+    return np.array([feature_dict[feat] for feat in input_features])
 
+
+def predict_ozone(scenario, features=None):
     # ====================================
-    # Load pretrained XGBoost model
+    # Use LLM to map scenario to input features
     # ====================================
-    base_path = os.path.dirname(__file__)
-    model_path = os.path.join(base_path, "xgb_ozone_model.json")
+    feature_dict = features if features is not None else run_climate_scenario_prediction(scenario)
+
+    with observe_stage("preprocessing", "ozone"):
+        X_input = ozone_input_row(feature_dict).reshape(1, -1)
 
-    model = xgb.XGBRegressor()
-    model.load_model(model_path)
+    # ====================================
+    # Pretrained XGBoost model from the registry
+    # ====================================
+    model = get_model("ozone")
 
     # ====================================
     # Predict ozone reading
     # ====================================
-    ozone_prediction = model.predict(X_input)[0]
+    with observe_stage("inference", "ozone"):
+        ozone_prediction = model.predict(X_input)[0]
     return float(ozone_prediction)
 
 
+def predict_ozone_batch(scenarios, features_list):
+    # One predict() over every scenario row instead of one per scenario
+    model = get_model("ozone")
+    now = datetime.now()
+
+    def predict_rows(X, indices):
+        return [float(value) for value in model.predict(X)]
+
+    return batch_predict(features_list, lambda f: ozone_input_row(f, now), predict_rows, component="ozone")
+
+
 # Example usage
 # scenario = "What if there's a sudden spike in vehicle emissions due to urban traffic in summer?"
 # predict_ozone(scenario)
@@ -1,80 +1,59 @@
-from tensorflow.keras.models import model_from_json
-from sklearn.preprocessing import MinMaxScaler
 import numpy as np
-import pandas as pd
+import hashlib
+import json
 import os
+import tempfile
+import threading
 from dotenv import load_dotenv
 load_dotenv()
-import plotly.graph_objects as go
-import cloudinary
-from cloudinary.utils import cloudinary_url
-
-print("Setting up Cloudinary for dataset access...")
-# Set up your Cloudinary credentials
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-    secure=True
-)
-print("Cloudinary configured successfully.")
-
-csv_url = os.getenv("DailyDelhiClimateTrain")
-print(f"CSV URL: {csv_url}")
-def predict_temp_lstm():
-
-    csvfile_url, _ = cloudinary_url(csv_url, resource_type="raw")
-
-    # Load dataset
-    base_path = os.path.dirname(__file__)
-
-    model_json_path = os.path.join(base_path, 'pretrained_lstm_model.json')
-
-    # Load model architecture
-    with open(model_json_path, 'r') as file:
-        model_json = file.read()
-
-    loaded_model = model_from_json(model_json)
-
-    # Load weights
-    weights_path = os.path.join(base_path, "pretrained_lstm.weights.h5")
-    loaded_model.load_weights(weights_path)
-    print("✅ Model loaded and weights restored.")
-
-    # Compile model
-    loaded_model.compile(optimizer='adam', loss='mse', metrics=['mae'])
-    print("✅ Model compiled successfully.")
+from model_registry import MODEL_ARTIFACTS, get_model
+from dataset_mirror import dataset_path
+from metrics import observe_stage
+from chart_payload import chart_payload
+from windowing import supervised_windows
+
+def temperature_series():
+    """
+    Runs the LSTM over every 60-day window of the Delhi dataset.
+
+    Returns:
+        tuple: (dates, predicted meantemp, actual meantemp) for every day
+            after the first window.
+    """
+    import pandas as pd
+    from sklearn.preprocessing import MinMaxScaler
+
+    # Compiled model with restored weights, shared from the registry
+    loaded_model = get_model("temperature_lstm")
 
     
-    print(f"📊 Loading data from: {csvfile_url}")
-    # Load new data
-    data_path = csvfile_url
-
-    new_df = pd.read_csv(data_path)
-    print("📊 Data loaded successfully.")
-    new_df['date'] = pd.to_datetime(new_df['date'])
-    new_df.set_index('date', inplace=True)
-
-    features = ['meantemp', 'humidity', 'wind_speed', 'meanpressure']
-    new_data = new_df[features].values
-
-    # Fit scaler on new data
-    scaler = MinMaxScaler()
-    scaled_new_data = scaler.fit_transform(new_data)
-
-    # Sequence function
-    def create_sequences(data, window_size):
-        X, y = [], []
-        for i in range(len(data) - window_size):
-            X.append(data[i:i + window_size])
-            y.append(data[i + window_size, 0])
-        return np.array(X), np.array(y)
-
-    window_size = 60
-    X_new, y_new = create_sequences(scaled_new_data, window_size)
+    # Load new data (local mirror of the Cloudinary dataset, never a network fetch)
+    data_path = dataset_path("DailyDelhiClimateTrain")
+    print(f"📊 Loading data from: {data_path}")
+
+    with observe_stage("dataset_load", "temperature_lstm"):
+        new_df = pd.read_csv(data_path)
+        print("📊 Data loaded successfully.")
+        new_df['date'] = pd.to_datetime(new_df['date'])
+        new_df.set_index('date', inplace=True)
+
+    with observe_stage("preprocessing", "temperature_lstm"):
+        features = ['meantemp', 'humidity', 'wind_speed', 'meanpressure']
+        new_data = new_df[features].values
+
+        # Fit scaler on new data
+        scaler = MinMaxScaler()
+        scaled_new_data = scaler.fit_transform(new_data)
+
+        # Every 60-day window as a view of the scaled data; float32 up front
+        # so the model reads the windows without copying them all
+        window_size = 60
+        X_new, y_new = supervised_windows(scaled_new_data.astype(np.float32), window_size,
+                                          target_column=0, flatten=False)
 
     # Predict
-    new_predictions_scaled = loaded_model.predict(X_new)
+    with observe_stage("inference", "temperature_lstm"):
+        new_predictions_scaled = loaded_model.predict(X_new)
 
     # Inverse transform predictions
     new_predictions_full = np.zeros((len(new_predictions_scaled), scaled_new_data.shape[1]))
@@ -83,14 +62,27 @@ def predict_temp_lstm():
 
     print(f"🌡️ Latest Predicted Temperature: {new_predictions[-1]:.2f}°C")
 
+    return new_df.index[window_size:], new_predictions, new_df['meantemp'].values[window_size:]
 
-   
+
+TEMPERATURE_CHART = {
+    "title": 'Temperature Prediction for Last 60+ Days',
+    "x_title": 'Date',
+    "y_title": 'Temperature (°C)',
+}
+
+
+def predict_temp_lstm():
+    # Only the Plotly variant of the graph needs plotly
+    import plotly.graph_objects as go
+
+    dates, new_predictions, actual = temperature_series()
 
     # Plot with Plotly
     fig = go.Figure()
 
     fig.add_trace(go.Scatter(
-    x=new_df.index[window_size:], 
+    x=dates, 
     y=new_predictions, 
     mode='lines',
     name='Predicted Temperature',
@@ -98,17 +90,17 @@ def predict_temp_lstm():
     ))
 
     fig.add_trace(go.Scatter(
-    x=new_df.index[window_size:], 
-    y=new_df['meantemp'].values[window_size:], 
+    x=dates, 
+    y=actual, 
     mode='lines',
     name='Actual Temperature',
     line=dict(color='royalblue', dash='dot')
     ))
 
     fig.update_layout(
-    title='Temperature Prediction for Last 60+ Days',
-    xaxis_title='Date',
-    yaxis_title='Temperature (°C)',
+    title=TEMPERATURE_CHART["title"],
+    xaxis_title=TEMPERATURE_CHART["x_title"],
+    yaxis_title=TEMPERATURE_CHART["y_title"],
     legend_title='Legend',
     template='plotly_white',
     hovermode='x unified'
@@ -116,7 +108,114 @@ def predict_temp_lstm():
 
     
 
+    with observe_stage("serialization", "temperature_lstm"):
+        plotly_json = fig.to_json()
+
     return {
-        "predicted_temperature": new_predictions[-1],
-        "plotly": fig.to_json(),
+        "predicted_temperature": float(new_predictions[-1]),
+        "plotly": plotly_json,
     }
+
+
+def temperature_chart(encoding="json"):
+    # Same graph as predict_temp_lstm as a columnar payload (see chart_payload)
+    dates, new_predictions, actual = temperature_series()
+    with observe_stage("serialization", "temperature_lstm"):
+        chart = chart_payload(
+            dates.values,
+            [("Predicted Temperature", new_predictions, {"mode": "lines", "color": "firebrick"}),
+             ("Actual Temperature", actual, {"mode": "lines", "color": "royalblue", "dash": "dot"})],
+            encoding=encoding, precision=2, **TEMPERATURE_CHART,
+        )
+    return {
+        "predicted_temperature": float(new_predictions[-1]),
+        "chart": chart,
+    }
+
+
+# ====================================
+# Cached graph, keyed on its inputs
+# ====================================
+# The graph only changes with the dataset or the model files, so it is
+# computed once per input fingerprint and kept in memory and on disk.
+GRAPH_CACHE_DIR = os.getenv("GRAPH_CACHE_DIR", os.path.join(os.path.dirname(__file__), ".graph_cache"))
+
+# Response variants: "plotly" (fig.to_json) and the columnar chart encodings
+GRAPH_VARIANTS = {
+    "plotly": lambda: {"prediction": predict_temp_lstm()},
+    "columnar": lambda: {"prediction": temperature_chart("json")},
+    "columnar-base64": lambda: {"prediction": temperature_chart("base64")},
+}
+
+_graph_lock = threading.Lock()
+_graphs = {}  # variant -> {"key", "etag", "body"}
+_file_hashes = {}
+
+
+def _file_sha256(path):
+    # Re-hashed only when the file's size or mtime changes
+    stat = os.stat(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = _file_hashes.get(path)
+    if cached is None or cached[0] != signature:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        cached = _file_hashes[path] = (signature, digest.hexdigest())
+    return cached[1]
+
+
+def graph_fingerprint():
+    # dataset hash + hash of the architecture JSON and weights
+    _, model_files = MODEL_ARTIFACTS["temperature_lstm"]
+    model_digest = hashlib.sha256("".join(
+        _file_sha256(os.path.join(os.path.dirname(__file__), f)) for f in model_files
+    ).encode()).hexdigest()
+    return f"{_file_sha256(dataset_path('DailyDelhiClimateTrain'))[:16]}-{model_digest[:16]}"
+
+
+def cached_temperature_graph(variant="plotly"):
+    """
+    The /temperature-graph/ response body in one of GRAPH_VARIANTS, recomputed
+    only when the dataset or the LSTM files change.
+
+    Returns:
+        tuple: (ETag, JSON response body as bytes)
+    """
+    key = graph_fingerprint()
+    graph = _graphs.get(variant)
+    if graph and graph["key"] == key:
+        return graph["etag"], graph["body"]
+
+    with _graph_lock:
+        graph = _graphs.get(variant)
+        if graph and graph["key"] == key:
+            return graph["etag"], graph["body"]
+
+        # The plotly variant keeps its original file name and ETag
+        tag = key if variant == "plotly" else f"{variant}-{key}"
+        cache_path = os.path.join(GRAPH_CACHE_DIR, f"temperature_graph-{tag}.json")
+        if os.path.exists(cache_path):
+            with open(cache_path, 'rb') as f:
+                body = f.read()
+        else:
+            body = json.dumps(GRAPH_VARIANTS[variant]()).encode("utf-8")
+            os.makedirs(GRAPH_CACHE_DIR, exist_ok=True)
+            # A temp file of its own, so workers missing the cache together
+            # never write into the same file before the atomic rename
+            with tempfile.NamedTemporaryFile(dir=GRAPH_CACHE_DIR, prefix=".temperature_graph-",
+                                             suffix=".tmp", delete=False) as f:
+                f.write(body)
+            os.chmod(f.name, 0o644)  # mkstemp creates it 0600
+            os.replace(f.name, cache_path)
+            # Graphs for older inputs are never served again
+            for name in os.listdir(GRAPH_CACHE_DIR):
+                if name.startswith("temperature_graph-") and not name.endswith(f"-{key}.json"):
+                    try:
+                        os.remove(os.path.join(GRAPH_CACHE_DIR, name))
+                    except FileNotFoundError:
+                        pass  # pruned by another worker
+
+        _graphs[variant] = {"key": key, "etag": f'"{tag}"', "body": body}
+        return _graphs[variant]["etag"], body
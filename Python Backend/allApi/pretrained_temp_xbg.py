@@ -1,87 +1,11 @@
-import xgboost as xgb
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
-import pandas as pd
-import os
 from LLM import run_climate_scenario_prediction
+from batching import batch_predict
+from windowing import append_window
+from metrics import observe_stage
+from model_registry import get_model, get_preprocessing
 
-import cloudinary
-from cloudinary.utils import cloudinary_url
-
-print("Setting up Cloudinary for dataset access...")
-# Set up your Cloudinary credentials
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-    secure=True
-)
-print("Cloudinary configured successfully.")
-
-csv_url = os.getenv("DailyDelhiClimateTrain")
-csvfile_url, _ = cloudinary_url(csv_url, resource_type="raw")
-def predict_temp(prompt):
-    # Run the LLM scenario-based prediction
-    scenario = prompt
-    prediction = run_climate_scenario_prediction(scenario)
-
-# Load dataset
-    base_path = os.path.dirname(__file__)  # folder of this script
-    file_path = csv_url
-    df  = pd.read_csv(file_path)
-
-# Preprocess
-    df['date'] = pd.to_datetime(df['date'])
-    df.set_index('date', inplace=True)
-
-    features = ['meantemp', 'humidity', 'wind_speed', 'meanpressure']
-    data = df[features].values
-
-# Scale features
-    scaler = MinMaxScaler()
-    scaled_data = scaler.fit_transform(data)
-
-# Create sequences for XGBoost
-    def create_xgb_sequences(data, window_size, target_column):
-        X, y = [], []
-        for i in range(len(data) - window_size):
-            window = data[i:i + window_size].flatten()
-            X.append(window)
-            y.append(data[i + window_size, target_column])
-        return np.array(X), np.array(y)
-
-    window_size = 30
-    target_column = 0  # meantemp
-    X, y = create_xgb_sequences(scaled_data, window_size, target_column)
-
-# Train/test split
-    split = int(0.8 * len(X))
-    X_test, y_test = X[split:], y[split:]
-
-# Load the trained model
-    model_path = os.path.join(base_path, 'xgb_temp_model.json')
-    loaded_model = xgb.XGBRegressor()
-    loaded_model.load_model(model_path)
-
-# Predict on test set
-    y_pred_scaled = loaded_model.predict(X_test)
-
-# Rescale prediction
-    y_pred_full = np.zeros((len(y_pred_scaled), scaled_data.shape[1]))
-    y_pred_full[:, target_column] = y_pred_scaled
-
-    y_test_full = np.zeros((len(y_test), scaled_data.shape[1]))
-    y_test_full[:, target_column] = y_test
-
-    y_pred_rescaled = scaler.inverse_transform(y_pred_full)[:, target_column]
-    y_test_rescaled = scaler.inverse_transform(y_test_full)[:, target_column]
-
-# print(f"Latest Predicted Temperature from Test Data: {y_pred_rescaled[-1]:.2f}°C")
-
-# =======================
-# Use LLM Scenario Input
-# =======================
-
+def scenario_window(prediction, preprocessing):
 # Extract LLM-based scenario input
     llm_input_features = np.array([
     prediction["meantemp"],
@@ -91,26 +15,13 @@ def predict_temp(prompt):
 ]).reshape(1, -1)
 
 # Scale LLM input using same scaler
-    llm_scaled = scaler.transform(llm_input_features)
-
-# Get the last sequence from the dataset
-    last_sequence = scaled_data[-window_size:].flatten()
+    llm_scaled = preprocessing.transform(llm_input_features)
 
 # Construct new sequence by sliding and appending LLM input
 # (remove the oldest row, add the new LLM input)
-    window_features = scaled_data[-window_size+1:]
-    new_window = np.vstack([window_features, llm_scaled]).flatten()
-
-# Predict using the model with LLM scenario
-    llm_pred_scaled = loaded_model.predict(new_window.reshape(1, -1))
-
-# Rescale the predicted temperature
-    llm_pred_full = np.zeros((1, scaled_data.shape[1]))
-    llm_pred_full[:, target_column] = llm_pred_scaled
-    llm_pred_rescaled = scaler.inverse_transform(llm_pred_full)[0, target_column]
-
-    print(f"🌞 Predicted Temperature with LLM Scenario : {llm_pred_rescaled:.2f}°C")
+    return append_window(preprocessing.last_window, llm_scaled)
 
+def format_prediction(prediction, llm_pred_rescaled):
     return {
         "meantemp": llm_pred_rescaled,
         "humidity": prediction["humidity"],
@@ -127,5 +38,47 @@ def predict_temp(prompt):
         "Temperature": llm_pred_rescaled
     }
 
+def predict_temp(prompt, features=None):
+    # Run the LLM scenario-based prediction (unless the caller already extracted the features)
+    scenario = prompt
+    prediction = features if features is not None else run_climate_scenario_prediction(scenario)
+
+# Fitted scaler and last dataset window (built by preprocessing.py)
+    preprocessing = get_preprocessing("temperature")
+    target_column = preprocessing.target_column  # meantemp
+
+# Trained model, shared from the registry
+    loaded_model = get_model("temperature")
+
+# =======================
+# Use LLM Scenario Input
+# =======================
+    with observe_stage("preprocessing", "temperature"):
+        new_window = scenario_window(prediction, preprocessing)
+
+# Predict using the model with LLM scenario
+    with observe_stage("inference", "temperature"):
+        llm_pred_scaled = loaded_model.predict(new_window.reshape(1, -1))
+
+# Rescale the predicted temperature
+    llm_pred_rescaled = preprocessing.inverse_transform_column(llm_pred_scaled, target_column)[0]
+
+    print(f"🌞 Predicted Temperature with LLM Scenario : {llm_pred_rescaled:.2f}°C")
+
+    return format_prediction(prediction, llm_pred_rescaled)
+
+def predict_temp_batch(scenarios, features_list):
+    # One predict() over every scenario window instead of one per scenario
+    preprocessing = get_preprocessing("temperature")
+    loaded_model = get_model("temperature")
+
+    def predict_rows(X, indices):
+        rescaled = preprocessing.inverse_transform_column(loaded_model.predict(X), preprocessing.target_column)
+        return [format_prediction(features_list[i], value) for i, value in zip(indices, rescaled)]
+
+    return batch_predict(features_list, lambda f: scenario_window(f, preprocessing), predict_rows, component="temperature")
+
 
-predict_temp("What if half the earth becomes ice??")
\ No newline at end of file
+# Example usage
+if __name__ == "__main__":
+    predict_temp("What if half the earth becomes ice??")
@@ -0,0 +1,143 @@
+from typing import Annotated, Any, Dict, List, Optional
+
+from pydantic import BaseModel, BeforeValidator
+
+from fast_json import to_builtin
+
+# Response schemas for every JSON route. Float fields accept NumPy scalars
+# as they are; free-form values (LLM features, per-predictor results, stats)
+# are converted from NumPy once, on validation.
+JSONValue = Annotated[Any, BeforeValidator(to_builtin)]
+LLMFeatures = Dict[str, JSONValue]
+
+
+# ====================================
+# Scenario predictors
+# ====================================
+class TemperaturePrediction(BaseModel):
+    # The model's output; the other fields echo the LLM features as returned
+    # (possibly null or non-numeric), as they always have
+    meantemp: float
+    humidity: JSONValue
+    wind_speed: JSONValue
+    meanpressure: JSONValue
+    Economic_Impact_Million_USD: JSONValue
+    Total_Precipitation_mm: JSONValue
+    CO2_Emissions_MT: JSONValue
+    Crop_Yield_MT_per_HA: JSONValue
+    Pesticide_Use_KG_per_HA: JSONValue
+    Fertilizer_Use_KG_per_HA: JSONValue
+    Soil_Health_Index: JSONValue
+    solar_generation: JSONValue
+    Temperature: float
+
+
+class TemperatureResponse(BaseModel):
+    prediction: TemperaturePrediction
+
+
+class HumidityPrediction(BaseModel):
+    predicted_humidity: float
+    original_scenario: str
+    llm_prediction: LLMFeatures
+
+
+class HumidityResponse(BaseModel):
+    prediction: HumidityPrediction
+
+
+class OzoneResponse(BaseModel):
+    prediction: float
+
+
+class CropRate(BaseModel):
+    latest_test_crop_yield: float
+    llm_predicted_crop_yield: float
+    llm_input: LLMFeatures
+
+
+class CropRateResponse(BaseModel):
+    success: bool
+    result: CropRate
+
+
+class EconomicImpactResponse(BaseModel):
+    message: str
+    scenario: str
+    predicted_economic_impact_million_usd: float
+
+
+class AdaptationResponse(BaseModel):
+    # Served with response_model_exclude_unset: either the strategy or the error
+    success: bool
+    predicted_adaptation_strategy: Optional[str] = None
+    error: Optional[str] = None
+
+
+class TextResponse(BaseModel):
+    prediction: str
+
+
+# ====================================
+# Composite and batch scenarios
+# ====================================
+class PredictorOutcome(BaseModel):
+    # Served with response_model_exclude_unset: either the result or the error
+    success: bool
+    result: JSONValue = None
+    error: Optional[str] = None
+    seconds: Optional[float] = None
+
+
+class ScenarioResponse(BaseModel):
+    scenario: str
+    llm_features: LLMFeatures
+    llm_seconds: float
+    results: Dict[str, PredictorOutcome]
+    failed: List[str]
+    total_seconds: float
+
+
+class BatchOutcome(PredictorOutcome):
+    scenario: str
+
+
+class BatchResponse(BaseModel):
+    predictor: str
+    count: int
+    succeeded: int
+    llm_seconds: float
+    inference_seconds: float
+    total_seconds: float
+    results: List[BatchOutcome]
+
+
+# ====================================
+# Electricity and sentiment
+# ====================================
+class HorizonSeries(BaseModel):
+    title: str
+    bucket: str
+    timestamp: List[str]
+    total: List[float]
+    mean: List[float]
+    peak: List[float]
+    lowest: List[float]
+    hours: List[int]
+
+
+class ElectricityForecastResponse(BaseModel):
+    start_time: str
+    hourly: HorizonSeries
+    daily: HorizonSeries
+    monthly: HorizonSeries
+
+
+class SentimentResponse(BaseModel):
+    text: str
+    sentiment: str
+    score: float
+
+
+# Operational endpoints (/model_registry, /startup, ...) are free-form
+StatsResponse = Dict[str, JSONValue]
@@ -0,0 +1,96 @@
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+# Signs, decimal points and percentages attached to numbers carry meaning;
+# thousands separators and every other punctuation mark don't.
+_KEPT_PUNCTUATION = re.compile(r"([-+](?=\d)|(?<=\d)\.(?=\d)|(?<=\d)%)|((?<=\d),(?=\d{3}))|[^\w\s]")
+
+
+def normalize_scenario(scenario: str) -> str:
+    """
+    Canonical form of a scenario used as cache key, so that
+    "What if half the Earth becomes ice??" and "what if half the earth
+    becomes ice" share one entry.
+    """
+    text = unicodedata.normalize("NFKC", scenario).casefold()
+    text = _KEPT_PUNCTUATION.sub(lambda m: m.group(1) or ("" if m.group(2) else " "), text)
+    return " ".join(text.split())
+
+
+class ScenarioCache:
+    """
+    Thread-safe LRU cache whose entries also expire after `ttl_seconds`.
+    Keys are normalized scenario strings.
+    """
+
+    def __init__(self, max_entries=512, ttl_seconds=3600, enabled=True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, scenario):
+        if not self.enabled:
+            return None
+        key = normalize_scenario(scenario)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, scenario, value):
+        if not self.enabled or self.max_entries <= 0:
+            return
+        key = normalize_scenario(scenario)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# Shared by every predictor that extracts scenario features through the LLM.
+# SCENARIO_CACHE_DISABLED=1 turns it off.
+feature_cache = ScenarioCache(
+    max_entries=int(os.getenv("SCENARIO_CACHE_MAX_ENTRIES", "512")),
+    ttl_seconds=float(os.getenv("SCENARIO_CACHE_TTL_SECONDS", "3600")),
+    enabled=os.getenv("SCENARIO_CACHE_DISABLED", "").lower() not in ("1", "true", "yes"),
+)
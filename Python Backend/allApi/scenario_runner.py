@@ -0,0 +1,199 @@
+import asyncio
+import importlib
+import os
+import time
+
+from LLM import run_climate_scenario_prediction
+from async_utils import SingleFlight
+from executors import cpu_executor, llm_executor
+from scenario_cache import normalize_scenario
+
+# ====================================
+# Predictors fed by one LLM feature extraction
+# ====================================
+# name -> (module, function, batch function); imported on first use like the endpoints do
+SCENARIO_PREDICTORS = {
+    "temperature": ("pretrained_temp_xbg", "predict_temp", "predict_temp_batch"),
+    "humidity": ("pretrained_humidity_xgb", "predict_humidity", "predict_humidity_batch"),
+    "crop_yield": ("pretrained_croprate_xgb", "predict_croprate", "predict_croprate_batch"),
+    "economic_impact": ("pretrained_eco_xgb", "predict_eco", "predict_eco_batch"),
+    "ozone": ("pretrained_ozone_xgb", "predict_ozone", "predict_ozone_batch"),
+    "adaptation": ("classify", "classify_adaptation", "classify_adaptation_batch"),
+}
+
+# Batch scoring limits
+BATCH_MAX_SCENARIOS = int(os.getenv("BATCH_MAX_SCENARIOS", "5000"))
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "8"))
+
+
+# Identical scenarios arriving concurrently share one LLM call and model run
+scenario_flights = SingleFlight()
+
+
+class FeatureExtractionError(Exception):
+    """Raised when the LLM answer for a scenario could not be parsed into features."""
+
+
+def run_predictor(name, scenario, features):
+    # Module-level so it can also be shipped to a process pool
+    module_name, function_name, _ = SCENARIO_PREDICTORS[name]
+    predictor = getattr(importlib.import_module(module_name), function_name)
+    return predictor(scenario, features=features)
+
+
+def run_batch_predictor(name, scenarios, features_list):
+    module_name, _, function_name = SCENARIO_PREDICTORS[name]
+    predictor = getattr(importlib.import_module(module_name), function_name)
+    return predictor(scenarios, features_list)
+
+
+async def extract_features(scenario: str) -> dict:
+    # Blocking Groq call, kept off the event loop on the LLM pool. Concurrent
+    # requests for the same scenario from different endpoints share it.
+    features = await scenario_flights.do(
+        "llm_features", normalize_scenario(scenario),
+        lambda: llm_executor.run(run_climate_scenario_prediction, scenario)
+    )
+    if not isinstance(features, dict):
+        # The LLM answer could not be parsed; every predictor depends on it.
+        # The raw answer goes to the log, not to the client.
+        print(f"❌ Could not parse LLM features: {features}")
+        raise FeatureExtractionError("Could not parse the LLM answer into scenario features")
+    return dict(features)
+
+
+async def _timed_predictor(name, scenario, features):
+    start = time.perf_counter()
+    try:
+        result = await cpu_executor.run(run_predictor, name, scenario, features)
+        return {"success": True, "result": result, "seconds": round(time.perf_counter() - start, 4)}
+    except Exception as e:
+        return {"success": False, "error": str(e), "seconds": round(time.perf_counter() - start, 4)}
+
+
+def _echo_scenario(result, scenario):
+    # Coalesced callers may differ in case or whitespace; each gets its own
+    # text back where a predictor echoes it (humidity's original_scenario)
+    if isinstance(result, dict) and "original_scenario" in result:
+        return dict(result, original_scenario=scenario)
+    return result
+
+
+async def predict_one(name: str, scenario: str):
+    """
+    Runs a single scenario predictor (LLM extraction on the LLM pool, model on
+    the CPU pool), coalesced with identical in-flight requests.
+    """
+    async def compute():
+        features = await extract_features(scenario)
+        return await cpu_executor.run(run_predictor, name, scenario, features)
+
+    result = await scenario_flights.do(name, normalize_scenario(scenario), compute)
+    return _echo_scenario(result, scenario)
+
+
+async def run_scenario(scenario: str, predictors=None) -> dict:
+    """
+    Extracts the LLM features for `scenario` once and runs every predictor on
+    them concurrently. A failing predictor is reported in the document instead
+    of failing the whole request.
+
+    Args:
+        scenario (str): The user-defined climate scenario description.
+        predictors (list, optional): Subset of SCENARIO_PREDICTORS to run.
+
+    Returns:
+        dict: Combined results with per-predictor timing.
+    """
+    names = list(predictors or SCENARIO_PREDICTORS)
+    unknown = [name for name in names if name not in SCENARIO_PREDICTORS]
+    if unknown:
+        raise ValueError(f"Unknown predictor(s): {', '.join(unknown)}")
+
+    key = f"{normalize_scenario(scenario)}|{','.join(sorted(names))}"
+    document = await scenario_flights.do("scenario", key, lambda: _run_scenario(scenario, names))
+    # Copies, the coalesced document is shared with the other callers
+    results = {
+        name: dict(outcome, result=_echo_scenario(outcome["result"], scenario)) if "result" in outcome else outcome
+        for name, outcome in document["results"].items()
+    }
+    return dict(document, scenario=scenario, results=results)
+
+
+async def _run_scenario(scenario, names):
+    start = time.perf_counter()
+    features = await extract_features(scenario)
+    llm_seconds = round(time.perf_counter() - start, 4)
+
+    outcomes = await asyncio.gather(*(
+        _timed_predictor(name, scenario, features) for name in names
+    ))
+    results = dict(zip(names, outcomes))
+
+    return {
+        "scenario": scenario,
+        "llm_features": features,
+        "llm_seconds": llm_seconds,
+        "results": results,
+        "failed": [name for name, outcome in results.items() if not outcome["success"]],
+        "total_seconds": round(time.perf_counter() - start, 4),
+    }
+
+
+async def run_batch(name: str, scenarios: list) -> dict:
+    """
+    Scores many scenarios with one predictor: LLM features are extracted with
+    at most BATCH_LLM_CONCURRENCY calls in flight, then every valid row goes
+    through a single vectorized predict on the CPU pool.
+
+    Args:
+        name (str): One of SCENARIO_PREDICTORS.
+        scenarios (list): Scenario descriptions, at most BATCH_MAX_SCENARIOS.
+
+    Returns:
+        dict: One outcome per scenario, in input order, plus stage timings.
+    """
+    if name not in SCENARIO_PREDICTORS:
+        raise ValueError(f"Unknown predictor: {name}")
+    if len(scenarios) > BATCH_MAX_SCENARIOS:
+        raise ValueError(f"At most {BATCH_MAX_SCENARIOS} scenarios per batch")
+
+    start = time.perf_counter()
+    semaphore = asyncio.Semaphore(BATCH_LLM_CONCURRENCY)
+
+    async def features_for(scenario):
+        async with semaphore:
+            try:
+                return await extract_features(scenario)
+            except Exception as e:
+                return e
+
+    features = await asyncio.gather(*(features_for(scenario) for scenario in scenarios))
+    llm_seconds = round(time.perf_counter() - start, 4)
+
+    valid = [i for i, f in enumerate(features) if isinstance(f, dict)]
+    outcomes = [{"success": False, "error": f"LLM feature extraction failed: {f}"} for f in features]
+
+    inference_start = time.perf_counter()
+    if valid:
+        try:
+            batch_outcomes = await cpu_executor.run(
+                run_batch_predictor, name, [scenarios[i] for i in valid], [features[i] for i in valid]
+            )
+        except Exception as e:
+            # e.g. a missing model artifact: every row fails, like a failed predictor in run_scenario
+            print(f"❌ Batch predictor '{name}' failed: {e}")
+            batch_outcomes = [{"success": False, "error": str(e)}] * len(valid)
+        for i, outcome in zip(valid, batch_outcomes):
+            outcomes[i] = outcome
+    inference_seconds = round(time.perf_counter() - inference_start, 4)
+
+    return {
+        "predictor": name,
+        "count": len(scenarios),
+        "succeeded": sum(1 for outcome in outcomes if outcome["success"]),
+        "llm_seconds": llm_seconds,
+        "inference_seconds": inference_seconds,
+        "total_seconds": round(time.perf_counter() - start, 4),
+        "results": [dict(outcome, scenario=scenario) for scenario, outcome in zip(scenarios, outcomes)],
+    }
@@ -1,23 +1,32 @@
-import pandas as pd
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
-import nltk
 import os
 
-# === Download VADER Lexicon (only once) ===
-nltk.download('vader_lexicon', quiet=True)
-
-# === Initialize VADER Analyzer ===
-sid = SentimentIntensityAnalyzer()
+_sid = None
+
+# === Initialize VADER Analyzer (on first use) ===
+def get_sentiment_analyzer():
+    global _sid
+    if _sid is None:
+        import nltk
+        from nltk.sentiment.vader import SentimentIntensityAnalyzer
+        # Bundled sentiment/vader_lexicon.zip next to this file; download only if missing
+        nltk.data.path.append(os.path.dirname(__file__))
+        try:
+            nltk.data.find('sentiment/vader_lexicon.zip')
+        except LookupError:
+            nltk.download('vader_lexicon', quiet=True)
+        _sid = SentimentIntensityAnalyzer()
+    return _sid
 
 # === Sentiment Classification Function ===
 def get_sentiment(text):
-    scores = sid.polarity_scores(text)
+    scores = get_sentiment_analyzer().polarity_scores(text)
     compound = scores['compound']
     label = 'POSITIVE' if compound >= 0.05 else 'NEGATIVE' if compound <= -0.05 else 'NEUTRAL'
     return label, compound
 
 # === Analyze a CSV Dataset ===
 def analyze_dataset(input_csv, output_csv):
+    import pandas as pd
     df = pd.read_csv(input_csv)
     df = df.dropna(subset=['clean_text'])
     results = df['clean_text'].apply(get_sentiment)
@@ -0,0 +1,99 @@
+import importlib
+import os
+import subprocess
+import sys
+import time
+
+base_path = os.path.dirname(__file__)
+
+# Every allApi module; all of them must be side-effect free at import
+ALLAPI_MODULES = [
+    "main",
+    "LLM",
+    "async_utils",
+    "batching",
+    "chart_payload",
+    "classify",
+    "dataset_mirror",
+    "electricity_store",
+    "executors",
+    "explaination_agent",
+    "fast_json",
+    "geopolitics_agent",
+    "llm_replay",
+    "metrics",
+    "model_evaluation",
+    "model_registry",
+    "numpy_lstm",
+    "preprocessing",
+    "pretrained_croprate_xgb",
+    "pretrained_eco_xgb",
+    "pretrained_electricity",
+    "pretrained_humidity_xgb",
+    "pretrained_ozone_xgb",
+    "pretrained_temp_lstm",
+    "pretrained_temp_xbg",
+    "response_models",
+    "scenario_cache",
+    "scenario_runner",
+    "sentiments",
+    "tree_ensemble",
+    "windowing",
+]
+
+# Filled by main's lifespan hook, served on GET /startup
+startup_report = {"mode": None, "stages": {}, "errors": {}}
+
+
+class timed_stage:
+    """Context manager recording how long a startup stage took."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        startup_report["stages"][self.name] = round(time.perf_counter() - self.start, 4)
+        return False
+
+
+def loaded_allapi_modules():
+    return [name for name in ALLAPI_MODULES if name in sys.modules]
+
+
+def isolated_import_cost(module):
+    """
+    Seconds needed to import `module` in a fresh interpreter, i.e. including
+    every library it pulls in. Returns None when the import fails.
+    """
+    code = (
+        "import time, importlib; start = time.perf_counter(); "
+        f"importlib.import_module({module!r}); print(time.perf_counter() - start)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=base_path, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def import_report(modules=None):
+    report = {}
+    for module in modules or ALLAPI_MODULES:
+        cost = isolated_import_cost(module)
+        report[module] = None if cost is None else round(cost, 4)
+    return report
+
+
+if __name__ == "__main__":
+    print("📦 Import cost per allApi module (fresh interpreter each):")
+    for module, cost in sorted(import_report().items(), key=lambda item: -(item[1] or 0)):
+        print(f"  {module:<28} {'failed' if cost is None else f'{cost * 1000:8.1f} ms'}")
+
+    start = time.perf_counter()
+    importlib.import_module("main")
+    print(f"⏱️ import main: {(time.perf_counter() - start) * 1000:.1f} ms")
@@ -0,0 +1,227 @@
+import json
+
+import numpy as np
+
+# Objectives whose output is the raw margin
+_IDENTITY_OBJECTIVES = {"reg:squarederror", "reg:squaredlogerror", "reg:absoluteerror", "reg:pseudohubererror",
+                        "reg:quantileerror"}
+_LOGISTIC_OBJECTIVES = {"reg:logistic", "binary:logistic"}
+_SOFTMAX_OBJECTIVES = {"multi:softprob", "multi:softmax"}
+# Objectives that store base_score as exp(margin)
+_LOG_LINK_OBJECTIVES = {"count:poisson", "reg:gamma", "reg:tweedie"}
+
+
+def _parse_base_score(value):
+    # "5.7757854E-1" in older models, "[5.7757854E-1]" (one per target/class) in newer ones
+    return np.array([float(v) for v in str(value).strip("[]").split(",") if v.strip()], dtype=np.float32)
+
+
+class CompiledTreeEnsemble:
+    """
+    An XGBoost gbtree booster flattened into NumPy arrays: all trees share
+    one node table (feature, threshold, left, right, default_left, leaf
+    value), with leaves pointing at themselves so every row can descend all
+    trees at once for a fixed number of steps. Margins are accumulated in
+    float32 in tree order, like XGBoost's CPU predictor.
+    """
+
+    def __init__(self, learner):
+        objective = learner["objective"]["name"]
+        model_param = learner["learner_model_param"]
+        booster = learner["gradient_booster"]
+        if booster["name"] != "gbtree":
+            raise ValueError(f"Only gbtree boosters can be compiled, got {booster['name']}")
+        model = booster["model"]
+
+        self.objective = objective
+        self.feature_names = learner.get("feature_names") or None
+        self.num_feature = int(model_param["num_feature"])
+        self.num_groups = max(int(model_param.get("num_class", "0")), int(model_param.get("num_target", "1")), 1)
+
+        features, thresholds, lefts, rights, defaults, values, roots, depths = [], [], [], [], [], [], [], []
+        offset = 0
+        for tree in model["trees"]:
+            if tree.get("categories_nodes"):
+                raise ValueError("Categorical splits are not supported")
+            left = np.asarray(tree["left_children"], dtype=np.int64)
+            right = np.asarray(tree["right_children"], dtype=np.int64)
+            is_leaf = left == -1
+            node_ids = np.arange(len(left))
+
+            features.append(np.where(is_leaf, 0, tree["split_indices"]).astype(np.intp))
+            thresholds.append(np.asarray(tree["split_conditions"], dtype=np.float32))
+            lefts.append(np.where(is_leaf, node_ids, left) + offset)
+            rights.append(np.where(is_leaf, node_ids, right) + offset)
+            defaults.append(np.asarray(tree["default_left"], dtype=bool))
+            # Leaf values live in split_conditions for leaf nodes
+            values.append(np.where(is_leaf, thresholds[-1], 0).astype(np.float32))
+            roots.append(offset)
+            depths.append(self._depth(left, right))
+            offset += len(left)
+
+        self.feature = np.concatenate(features)
+        self.threshold = np.concatenate(thresholds)
+        self.left = np.concatenate(lefts)
+        self.right = np.concatenate(rights)
+        self.default_left = np.concatenate(defaults)
+        self.value = np.concatenate(values)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.max_depth = max(depths, default=0)
+        self.tree_group = np.asarray(model["tree_info"], dtype=np.intp)
+        self.group_trees = [np.flatnonzero(self.tree_group == g) for g in range(self.num_groups)]
+
+        base_score = _parse_base_score(model_param["base_score"])
+        if objective in _LOGISTIC_OBJECTIVES:
+            base_score = np.log(base_score / (np.float32(1) - base_score)).astype(np.float32)
+        elif objective in _LOG_LINK_OBJECTIVES:
+            base_score = np.log(base_score).astype(np.float32)
+        self.base_margin = np.broadcast_to(base_score, (self.num_groups,)).astype(np.float32)
+
+    @staticmethod
+    def _depth(left, right):
+        depth, frontier = 0, [0]
+        while frontier:
+            frontier = [child for node in frontier for child in (left[node], right[node]) if child != -1]
+            depth += bool(frontier)
+        return depth
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path, 'r') as f:
+            return cls(json.load(f)["learner"])
+
+    def _as_matrix(self, X):
+        if hasattr(X, "columns") and self.feature_names:
+            X = X[self.feature_names]  # DataFrames are matched by column name, like XGBoost
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.num_feature:
+            raise ValueError(f"Expected {self.num_feature} features, got {X.shape[1]}")
+        return X
+
+    def leaf_values(self, X):
+        """
+        (rows, trees) leaf value reached by every row in every tree.
+        """
+        X = self._as_matrix(X)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        has_missing = np.isnan(X).any()
+        for _ in range(self.max_depth):
+            split_values = X[rows, self.feature[nodes]]
+            go_left = split_values < self.threshold[nodes]
+            if has_missing:
+                go_left = np.where(np.isnan(split_values), self.default_left[nodes], go_left)
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.value[nodes]
+
+    def predict_margin(self, X):
+        """
+        (rows, groups) raw margins, i.e. output_margin=True in XGBoost.
+        """
+        leaves = self.leaf_values(X)
+        margins = np.empty((len(leaves), self.num_groups), dtype=np.float32)
+        for group, trees in enumerate(self.group_trees):
+            terms = np.empty((len(leaves), len(trees) + 1), dtype=np.float32)
+            terms[:, 0] = self.base_margin[group]
+            terms[:, 1:] = leaves[:, trees]
+            # cumsum adds tree by tree (not pairwise like sum) and so
+            # reproduces XGBoost's float32 rounding
+            margins[:, group] = np.cumsum(terms, axis=1, dtype=np.float32)[:, -1]
+        return margins
+
+    def predict_transformed(self, X):
+        margins = self.predict_margin(X)
+        if self.objective in _LOGISTIC_OBJECTIVES:
+            return (np.float32(1) / (np.float32(1) + np.exp(-margins))).astype(np.float32)
+        if self.objective in _SOFTMAX_OBJECTIVES:
+            exp = np.exp(margins - margins.max(axis=1, keepdims=True))
+            return (exp / exp.sum(axis=1, keepdims=True)).astype(np.float32)
+        if self.objective in _LOG_LINK_OBJECTIVES:
+            return np.exp(margins).astype(np.float32)
+        if self.objective not in _IDENTITY_OBJECTIVES:
+            raise ValueError(f"Unsupported objective: {self.objective}")
+        return margins
+
+
+class CompiledRegressor(CompiledTreeEnsemble):
+    """Drop-in for XGBRegressor.predict."""
+
+    def predict(self, X):
+        output = self.predict_transformed(X)
+        return output[:, 0] if self.num_groups == 1 else output
+
+
+class CompiledClassifier(CompiledTreeEnsemble):
+    """Drop-in for XGBClassifier.predict / predict_proba."""
+
+    def predict_proba(self, X):
+        proba = self.predict_transformed(X)
+        if self.num_groups == 1:
+            return np.hstack([1 - proba, proba])
+        return proba
+
+    def predict(self, X):
+        if self.num_groups == 1:
+            return (self.predict_transformed(X)[:, 0] > 0.5).astype(np.int64)
+        return np.argmax(self.predict_margin(X), axis=1)
+
+
+if __name__ == "__main__":
+    # Verifies every booster against xgboost and times single-row predictions
+    import os
+    import time
+    import xgboost as xgb
+    from model_registry import MODEL_ARTIFACTS, base_path
+
+    rng = np.random.default_rng(0)
+
+    def check(name, compiled, reference, X):
+        expected = reference.predict(X)
+        actual = compiled.predict(X)
+        identical = np.array_equal(np.asarray(expected), actual)
+
+        row = X[:1]
+        timings = {}
+        for label, model in (("xgboost", reference), ("compiled", compiled)):
+            model.predict(row)
+            start = time.perf_counter()
+            for _ in range(200):
+                model.predict(row)
+            timings[label] = (time.perf_counter() - start) / 200
+        print(f"{'✅' if identical else '❌'} {name:<22} bit-identical={identical} | single row: "
+              f"xgboost {timings['xgboost'] * 1e6:7.1f} us, compiled {timings['compiled'] * 1e6:7.1f} us")
+        return identical
+
+    results = []
+    for name, (kind, files) in MODEL_ARTIFACTS.items():
+        if kind not in ("xgb_regressor", "xgb_classifier"):
+            continue
+        path = os.path.join(base_path, files[0])
+        if not os.path.exists(path):
+            print(f"⚠️ {name:<22} missing {files[0]}")
+            continue
+        reference = xgb.XGBRegressor() if kind == "xgb_regressor" else xgb.XGBClassifier()
+        reference.load_model(path)
+        compiled = (CompiledRegressor if kind == "xgb_regressor" else CompiledClassifier).from_json(path)
+        X = rng.normal(size=(2000, compiled.num_feature)).astype(np.float32) * 3
+        results.append(check(name, compiled, reference, X))
+
+    # The adaptation classifier artifact is not in the repo, so also check
+    # freshly trained binary and multi-class classifiers
+    X = rng.normal(size=(500, 7)).astype(np.float32)
+    for label, y in (("binary_classifier", (X[:, 0] > 0).astype(int)), ("multiclass_classifier", np.digitize(X[:, 1], [-0.5, 0.5]))):
+        reference = xgb.XGBClassifier(n_estimators=50, max_depth=4).fit(X, y)
+        path = os.path.join(base_path, f".{label}.json")
+        reference.save_model(path)
+        try:
+            compiled = CompiledClassifier.from_json(path)
+        finally:
+            os.remove(path)
+        X_test = rng.normal(size=(2000, 7)).astype(np.float32)
+        X_test[::7, 3] = np.nan
+        results.append(check(label, compiled, reference, X_test))
+        print(f"   predict_proba max abs diff: {np.abs(reference.predict_proba(X_test) - compiled.predict_proba(X_test)).max():.2e}")
+
+    print("All boosters bit-identical" if all(results) else "Mismatch found")
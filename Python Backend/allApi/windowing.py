@@ -0,0 +1,112 @@
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+# Sliding windows over a (timesteps, features) series as strided views of the
+# series itself: window i is rows i .. i + window_size - 1, and building all
+# of them copies nothing. The views are read-only because windows overlap.
+# Shared by the training scripts and the predictors so both cut windows the
+# same way.
+
+
+def _series(data):
+    data = np.asarray(data)
+    if data.ndim == 1:
+        data = data[:, None]
+    # Copies only if the caller passed a non-contiguous array
+    return np.ascontiguousarray(data)
+
+
+def _window_count(data, window_size):
+    if window_size < 1 or window_size > len(data):
+        raise ValueError(f"window_size must be between 1 and {len(data)}, got {window_size}")
+    return len(data) - window_size + 1
+
+
+def lstm_windows(data, window_size):
+    """
+    Every full window, shaped for an LSTM.
+
+    Returns:
+        ndarray: Read-only (windows, window_size, features) view of `data`.
+    """
+    data = _series(data)
+    row, item = data.strides
+    return as_strided(data, shape=(_window_count(data, window_size), window_size, data.shape[1]),
+                      strides=(row, row, item), writeable=False)
+
+
+def xgb_windows(data, window_size):
+    """
+    Every full window flattened row-major into one feature row, the layout
+    the XGBoost models were trained on.
+
+    Returns:
+        ndarray: Read-only (windows, window_size * features) view of `data`.
+    """
+    data = _series(data)
+    row, item = data.strides
+    # A window of a C-contiguous series is contiguous, so flattening it is a view too
+    return as_strided(data, shape=(_window_count(data, window_size), window_size * data.shape[1]),
+                      strides=(row, item), writeable=False)
+
+
+def supervised_windows(data, window_size, target_column, flatten=True):
+    """
+    Training pairs: each window that has a next row, and that next row's
+    `target_column` value.
+
+    Args:
+        flatten (bool): XGBoost layout if True, LSTM layout otherwise.
+
+    Returns:
+        tuple: (X, y), both views of `data`.
+    """
+    data = _series(data)
+    windows = (xgb_windows if flatten else lstm_windows)(data, window_size)
+    return windows[:len(data) - window_size], data[window_size:, target_column]
+
+
+def last_window(data, window_size, flatten=False):
+    # Inference on the latest window only, without building the others
+    data = _series(data)
+    _window_count(data, window_size)
+    window = data[len(data) - window_size:]
+    return window.reshape(1, -1) if flatten else window[None]
+
+
+def append_window(history, row, flatten=True):
+    """
+    The window formed by `history` (window_size - 1 rows) followed by one new
+    row, e.g. a scenario appended to the latest data, built in one buffer.
+
+    Returns:
+        ndarray: (window_size * features,) if flatten, else (window_size, features).
+    """
+    history = _series(history)
+    row = np.asarray(row).ravel()
+    window = np.empty((len(history) + 1, history.shape[1]), dtype=np.result_type(history, row))
+    window[:-1] = history
+    window[-1] = row
+    return window.ravel() if flatten else window
+
+
+if __name__ == "__main__":
+    # Checks the views against the loop-based builders they replace
+    rng = np.random.default_rng(0)
+    data = rng.random((1462, 4))
+
+    X, y = supervised_windows(data, 30, target_column=1)
+    expected_X = np.array([data[i:i + 30].flatten() for i in range(len(data) - 30)])
+    expected_y = np.array([data[i + 30, 1] for i in range(len(data) - 30)])
+    print(f"{'✅' if np.array_equal(X, expected_X) and np.array_equal(y, expected_y) else '❌'} XGBoost windows "
+          f"{X.shape}, shares memory: {np.shares_memory(X, data)}")
+
+    X, y = supervised_windows(data, 60, target_column=0, flatten=False)
+    expected_X = np.array([data[i:i + 60] for i in range(len(data) - 60)])
+    print(f"{'✅' if np.array_equal(X, expected_X) and np.array_equal(y, data[60:, 0]) else '❌'} LSTM windows "
+          f"{X.shape}, shares memory: {np.shares_memory(X, data)}")
+
+    window = append_window(data[-29:], rng.random(4))
+    print(f"{'✅' if np.array_equal(window[:-4], data[-29:].flatten()) else '❌'} Appended window {window.shape}")
+    print(f"{'✅' if np.array_equal(last_window(data, 30, flatten=True)[0], xgb_windows(data, 30)[-1]) else '❌'} "
+          f"Last window")
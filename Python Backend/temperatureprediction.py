@@ -14,8 +14,11 @@ import plotly.graph_objects as go
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import os
+import sys
 
 base_path = os.path.dirname(__file__)  # folder of this script
+sys.path.append(os.path.join(base_path, 'allApi'))
+from windowing import supervised_windows
 file_path = os.path.join(base_path, 'Datasets', 'DailyDelhiClimateTrain.csv')
 
 df = pd.read_csv(file_path)
@@ -31,18 +34,10 @@ data = df[features].values
 scaler = MinMaxScaler()
 scaled_data = scaler.fit_transform(data)
 
-# Create flattened sequences for XGBoost
-def create_xgb_sequences(data, window_size, target_column):
-    X, y = [], []
-    for i in range(len(data) - window_size):
-        window = data[i:i + window_size].flatten()  # shape: window_size * num_features
-        X.append(window)
-        y.append(data[i + window_size, target_column])
-    return np.array(X), np.array(y)
-
 window_size = 30  # last 30 days
 target_column = 0  # 'meantemp'
-X, y = create_xgb_sequences(scaled_data, window_size, target_column)
+# Flattened windows for XGBoost, cut the same way the served predictors cut them
+X, y = supervised_windows(scaled_data, window_size, target_column)
 
 # Train-test split
 split = int(0.8 * len(X))
@@ -17,8 +17,11 @@ from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
 from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
 import os
+import sys
 
 base_path = os.path.dirname(__file__)  # folder of this script
+sys.path.append(os.path.join(base_path, 'allApi'))
+from windowing import supervised_windows
 file_path = os.path.join(base_path, 'Datasets', 'DailyDelhiClimateTrain.csv')
 
 df = pd.read_csv(file_path)
@@ -33,16 +36,9 @@ data = df[features].values
 scaler = MinMaxScaler()
 scaled_data = scaler.fit_transform(data)
 
-# Create sequences
-def create_sequences(data, window_size):
-    X, y = [], []
-    for i in range(len(data) - window_size):
-        X.append(data[i:i + window_size])
-        y.append(data[i + window_size, 0])  # predict meantemp only
-    return np.array(X), np.array(y)
-
+# Create sequences (views of scaled_data, predicting meantemp only)
 window_size = 60  # longer window (60 days)
-X, y = create_sequences(scaled_data, window_size)
+X, y = supervised_windows(scaled_data, window_size, target_column=0, flatten=False)
 
 # Train-test split
 split = int(0.8 * len(X))
@@ -173,15 +169,8 @@ new_data = new_df[['meantemp', 'humidity', 'wind_speed', 'meanpressure']].values
 # Scale using the SAME scaler (do NOT fit again!)
 scaled_new_data = scaler.transform(new_data)
 
-# Reuse the sequence creation function
-def create_sequences(data, window_size):
-    X, y = [], []
-    for i in range(len(data) - window_size):
-        X.append(data[i:i + window_size])
-        y.append(data[i + window_size, 0])  # we only care about meantemp
-    return np.array(X), np.array(y)
-
-X_new, y_new = create_sequences(scaled_new_data, window_size)
+# Reuse the same windowing
+X_new, y_new = supervised_windows(scaled_new_data, window_size, target_column=0, flatten=False)
 
 # Predict
 new_predictions_scaled = model.predict(X_new)